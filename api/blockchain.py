@@ -8,15 +8,24 @@ Fixes from audit:
 - recoverDust limited by contract
 - Pause support
 """
-import json
+import asyncio
+import functools
 import logging
-from web3 import Web3
-from web3.middleware import geth_poa_middleware
+import time
+import orjson
+import websockets
+from aiohttp import ClientSession, TCPConnector
+from collections.abc import Mapping
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from web3._utils.request import async_make_post_request
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from web3.logs import DISCARD
+from web3.middleware import async_geth_poa_middleware
 from config import config
 
 logger = logging.getLogger(__name__)
 
-CONTRACT_ABI = json.loads("""[
+CONTRACT_ABI = orjson.loads(b"""[
     {
         "inputs": [{"type": "uint8"}, {"type": "uint96"}],
         "name": "createTournament",
@@ -97,61 +106,399 @@ CONTRACT_ABI = json.loads("""[
         "outputs": [{"type": "bool"}],
         "stateMutability": "view",
         "type": "function"
+    },
+    {
+        "anonymous": false,
+        "inputs": [
+            {"indexed": true, "type": "uint256", "name": "id"},
+            {"indexed": false, "type": "uint8", "name": "arena"},
+            {"indexed": false, "type": "uint256", "name": "entryFee"}
+        ],
+        "name": "TournamentCreated",
+        "type": "event"
+    }
+]""")
+
+# Multicall3 is deployed at the same address on Base mainnet + Sepolia
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = orjson.loads(b"""[
+    {
+        "inputs": [{
+            "components": [
+                {"type": "address", "name": "target"},
+                {"type": "bool", "name": "allowFailure"},
+                {"type": "bytes", "name": "callData"}
+            ],
+            "type": "tuple[]",
+            "name": "calls"
+        }],
+        "name": "aggregate3",
+        "outputs": [{
+            "components": [
+                {"type": "bool", "name": "success"},
+                {"type": "bytes", "name": "returnData"}
+            ],
+            "type": "tuple[]",
+            "name": "returnData"
+        }],
+        "stateMutability": "payable",
+        "type": "function"
     }
 ]""")
 
 ZERO_ADDR = "0x0000000000000000000000000000000000000000"
 
+# Checksumming keccaks the address; agents recur across tournaments so memoize
+_checksum = functools.lru_cache(maxsize=4096)(AsyncWeb3.to_checksum_address)
+ZERO_ADDR_CS = AsyncWeb3.to_checksum_address(ZERO_ADDR)
+
+# Hot views skip web3's contract/formatter stack: fixed selectors + direct ABI decode
+SEL_GET_TOURNAMENT = AsyncWeb3.keccak(text="getTournament(uint256)")[:4]
+SEL_GET_STATS = AsyncWeb3.keccak(text="getStats()")[:4]
+SEL_PAUSED = AsyncWeb3.keccak(text="paused()")[:4]
+SEL_IS_PLAYER = AsyncWeb3.keccak(text="isPlayer(uint256,address)")[:4]
+TOURNAMENT_TYPES = ["uint8", "uint8", "uint96", "uint256", "uint32", "uint40"]
+STATS_TYPES = ["uint256", "uint256", "uint256", "uint256"]
+
+
+def _json_default(obj):
+    """orjson fallback for the non-JSON types web3 puts in params."""
+    if isinstance(obj, (bytes, bytearray)):
+        return "0x" + bytes(obj).hex()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Unable to serialize {type(obj).__name__}")
+
+
+class BatchingHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that coalesces concurrent requests into JSON-RPC batches.
+    Everything issued within BATCH_WINDOW seconds (or BATCH_SIZE requests)
+    goes out as one POST; responses are routed back to callers by id.
+    """
+    BATCH_WINDOW = 0.01
+    BATCH_SIZE = 50
+    POOL_SIZE = 100
+
+    def __init__(self, endpoint_uri: str, request_kwargs: dict | None = None):
+        super().__init__(endpoint_uri, request_kwargs)
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._in_flight: set[asyncio.Task] = set()
+        self._session_ready = False
+
+    async def _ensure_session(self):
+        """Swap web3's default session for a pooled keep-alive one (once, inside the loop)."""
+        if self._session_ready:
+            return
+        self._session_ready = True
+        await self.cache_async_session(ClientSession(
+            connector=TCPConnector(
+                limit=self.POOL_SIZE, limit_per_host=self.POOL_SIZE,
+                keepalive_timeout=60, ttl_dns_cache=300,
+            ),
+            headers={"Connection": "keep-alive"},
+            raise_for_status=True,
+        ))
+
+    async def make_request(self, method, params):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        request = {"jsonrpc": "2.0", "method": method, "params": params, "id": next(self.request_counter)}
+        self._pending.append((request, future))
+
+        if len(self._pending) >= self.BATCH_SIZE:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.BATCH_WINDOW, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _send_batch(self, batch: list[tuple[dict, asyncio.Future]]):
+        requests = [request for request, _ in batch]
+        payload = requests[0] if len(requests) == 1 else requests
+        try:
+            await self._ensure_session()
+            raw = await async_make_post_request(
+                self.endpoint_uri,
+                orjson.dumps(payload, default=_json_default),
+                **self.get_request_kwargs(),
+            )
+            decoded = orjson.loads(raw)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if isinstance(decoded, dict) and len(requests) > 1:
+            # Node refused the batch as a whole — every caller gets its error
+            responses = {r["id"]: {**decoded, "id": r["id"]} for r in requests}
+        else:
+            responses = {r.get("id"): r for r in (decoded if isinstance(decoded, list) else [decoded])}
+
+        for request, future in batch:
+            if future.done():
+                continue
+            future.set_result(responses.get(request["id"], {
+                "jsonrpc": "2.0", "id": request["id"],
+                "error": {"code": -32603, "message": "No response for request in JSON-RPC batch"},
+            }))
+
+
+class BlockWatcher:
+    """
+    Shared receipt waiter for all in-flight transactions.
+    One newHeads subscription (or one HTTP poll per block when no WS
+    endpoint is available) wakes every waiter, and each wake-up fetches
+    all outstanding receipts together so they share one RPC batch.
+    """
+    POLL_INTERVAL = 2  # seconds — one Base block
+
+    def __init__(self, w3: AsyncWeb3, ws_url: str = ""):
+        self.w3 = w3
+        self.ws_url = ws_url
+        self._waiters: dict[bytes, asyncio.Future] = {}
+        self._task: asyncio.Task | None = None
+
+    async def wait_for_receipt(self, tx_hash: bytes, timeout: float = 120) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[tx_hash] = future
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(f"Transaction {tx_hash.hex()} not mined after {timeout}s")
+        finally:
+            self._waiters.pop(tx_hash, None)
+
+    async def _run(self):
+        if self.ws_url:
+            try:
+                await self._watch_heads()
+            except Exception as e:
+                logger.warning(f"newHeads subscription failed, polling instead: {e}")
+        await self._poll()
+
+    async def _watch_heads(self):
+        async with websockets.connect(self.ws_url) as ws:
+            await ws.send(orjson.dumps({
+                "jsonrpc": "2.0", "id": 1,
+                "method": "eth_subscribe", "params": ["newHeads"],
+            }).decode())
+            await ws.recv()  # subscription id
+            while self._waiters:
+                await self._check_receipts()
+                await ws.recv()  # next head
+
+    async def _poll(self):
+        while self._waiters:
+            await self._check_receipts()
+            if self._waiters:
+                await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def _check_receipts(self):
+        pending = [h for h, f in self._waiters.items() if not f.done()]
+        receipts = await asyncio.gather(*(self._fetch_receipt(h) for h in pending))
+        for tx_hash, receipt in zip(pending, receipts):
+            future = self._waiters.get(tx_hash)
+            if receipt is not None and future is not None and not future.done():
+                future.set_result(receipt)
+
+    async def _fetch_receipt(self, tx_hash: bytes) -> dict | None:
+        try:
+            return await self.w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+        except Exception as e:
+            logger.warning(f"Receipt fetch failed for {tx_hash.hex()}: {e}")
+            return None
+
 
 class Blockchain:
+    VIEW_CACHE_TTL = 3  # seconds — views change at most once per ~2s block
+    FEE_REFRESH = 2     # seconds — one Base block
 
     def __init__(self):
-        self.w3 = Web3(Web3.HTTPProvider(config.RPC_URL))
-        self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        self.w3 = AsyncWeb3(BatchingHTTPProvider(config.RPC_URL))
+        self.w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
 
         if config.OWNER_PRIVATE_KEY:
             self.account = self.w3.eth.account.from_key(config.OWNER_PRIVATE_KEY)
+            self.address = self.account.address
         else:
             self.account = None
+            self.address = None
             logger.warning("No PRIVATE_KEY — read-only mode")
 
         if config.CONTRACT_ADDRESS:
             self.contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(config.CONTRACT_ADDRESS),
+                address=_checksum(config.CONTRACT_ADDRESS),
                 abi=CONTRACT_ABI,
             )
+            # Bind function factories once; hot paths skip the ABI lookup
+            fns = self.contract.functions
+            self._create_fn = fns.createTournament
+            self._resolve_fn = fns.resolve
+            self._cancel_fn = fns.cancel
+            self._set_paused_fn = fns.setPaused
+            self._get_tournament_fn = fns.getTournament
+            self._get_stats_fn = fns.getStats
+            self._paused_fn = fns.paused
         else:
             self.contract = None
             logger.warning("No CONTRACT_ADDRESS — contract calls disabled")
 
-    def _send_tx(self, fn, value=0) -> str:
+        self.multicall3 = self.w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        self.block_watcher = BlockWatcher(self.w3, config.WS_RPC_URL)
+        self._view_cache: dict[tuple, tuple[float, asyncio.Future]] = {}
+        self._fees: tuple[int, int] | None = None  # (maxFeePerGas, maxPriorityFeePerGas)
+        self._fee_task: asyncio.Task | None = None
+        # Txs can be sent concurrently (manager phases run in parallel):
+        # hand out nonces locally, under a lock, instead of racing the node
+        self._nonce: int | None = None
+        self._nonce_lock = asyncio.Lock()
+
+    async def _cached(self, key: tuple, fetch):
+        """
+        Return a view result from the short-lived cache. Concurrent misses
+        for the same key share one in-flight RPC; failures are not cached.
+        """
+        now = time.monotonic()
+        hit = self._view_cache.get(key)
+        if hit and hit[0] > now:
+            return await asyncio.shield(hit[1])
+
+        task = asyncio.ensure_future(fetch())
+        self._view_cache[key] = (now + self.VIEW_CACHE_TTL, task)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self._view_cache.get(key, (0, None))[1] is task:
+                del self._view_cache[key]
+            raise
+
+    def _invalidate(self, *keys: tuple):
+        for key in keys:
+            self._view_cache.pop(key, None)
+
+    # ───────── Fees (EIP-1559) ─────────
+
+    async def _refresh_fees(self):
+        history = await self.w3.eth.fee_history(5, "latest", [50])
+        next_base_fee = history["baseFeePerGas"][-1]
+        tips = [r[0] for r in history["reward"]] or [0]
+        priority_fee = sum(tips) // len(tips)
+        # 2x base fee survives several full blocks of base-fee growth
+        self._fees = (2 * next_base_fee + priority_fee, priority_fee)
+
+    async def _fee_loop(self):
+        while True:
+            await asyncio.sleep(self.FEE_REFRESH)
+            try:
+                await self._refresh_fees()
+            except Exception as e:
+                logger.warning(f"Fee refresh failed: {e}")
+
+    async def _get_fees(self) -> tuple[int, int]:
+        """Latest fee estimate; the first call fetches it and starts the refresher."""
+        if self._fees is None:
+            await self._refresh_fees()
+        if self._fee_task is None:
+            self._fee_task = asyncio.create_task(self._fee_loop())
+        return self._fees
+
+    async def _transact(self, fn, value=0) -> dict:
         if not self.account:
             raise Exception("No private key configured")
-        tx = fn.build_transaction({
-            "from": self.account.address,
-            "nonce": self.w3.eth.get_transaction_count(self.account.address),
-            "gas": 500_000,
-            "gasPrice": self.w3.eth.gas_price,
-            "chainId": config.CHAIN_ID,
-            "value": value,
-        })
-        signed = self.account.sign_transaction(tx)
-        tx_hash = self.w3.eth.send_raw_transaction(signed.rawTransaction)
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        max_fee, priority_fee = await self._get_fees()
+        async with self._nonce_lock:
+            if self._nonce is None:
+                self._nonce = await self.w3.eth.get_transaction_count(self.address, "pending")
+            try:
+                tx = await fn.build_transaction({
+                    "from": self.address,
+                    "nonce": self._nonce,
+                    "gas": 500_000,
+                    "type": 2,
+                    "maxFeePerGas": max_fee,
+                    "maxPriorityFeePerGas": priority_fee,
+                    "chainId": config.CHAIN_ID,
+                    "value": value,
+                })
+                signed = self.account.sign_transaction(tx)
+                tx_hash = await self.w3.eth.send_raw_transaction(signed.rawTransaction)
+            except Exception:
+                self._nonce = None  # resync from the node next time
+                raise
+            self._nonce += 1
+        receipt = await self.block_watcher.wait_for_receipt(tx_hash, timeout=120)
         if receipt["status"] != 1:
             raise Exception(f"Transaction reverted: {tx_hash.hex()}")
         logger.info(f"TX confirmed: {tx_hash.hex()}")
-        return tx_hash.hex()
+        return receipt
+
+    async def _send_tx(self, fn, value=0) -> str:
+        receipt = await self._transact(fn, value)
+        return receipt["transactionHash"].hex()
+
+    async def _eth_call(self, data: bytes, types: list[str]) -> tuple:
+        """
+        Raw eth_call against the ClawGame contract, straight to the provider.
+        No middleware, no result formatters, no AttributeDicts — just the
+        ABI-decoded tuple.
+        """
+        response = await self.w3.provider.make_request(
+            "eth_call",
+            [{"to": self.contract.address, "data": "0x" + data.hex()}, "latest"],
+        )
+        if "error" in response:
+            raise ValueError(response["error"])
+        return self.w3.codec.decode(types, bytes.fromhex(response["result"][2:]))
+
+    async def multicall(self, calls: list, allow_failure: bool = False) -> list:
+        """
+        Run several view calls on the ClawGame contract in one eth_call
+        via Multicall3.aggregate3. All results come from the same block.
+        Failed calls (only possible with allow_failure) come back as None.
+        """
+        results = await self.multicall3.functions.aggregate3([
+            (self.contract.address, allow_failure, fn._encode_transaction_data())
+            for fn in calls
+        ]).call()
+
+        decoded = []
+        for fn, (success, data) in zip(calls, results):
+            if not success:
+                decoded.append(None)
+                continue
+            values = self.w3.codec.decode([o["type"] for o in fn.abi["outputs"]], data)
+            decoded.append(values[0] if len(values) == 1 else values)
+        return decoded
 
     # ───────── Tournament ─────────
 
-    def create_tournament(self, arena: int, entry_fee_wei: int) -> tuple[str, int]:
-        fn = self.contract.functions.createTournament(arena, entry_fee_wei)
-        tx_hash = self._send_tx(fn)
-        on_chain_id = self.contract.functions.nextTournamentId().call() - 1
-        return tx_hash, on_chain_id
+    async def create_tournament(self, arena: int, entry_fee_wei: int) -> tuple[str, int]:
+        fn = self._create_fn(arena, entry_fee_wei)
+        receipt = await self._transact(fn)
+        self._invalidate(("stats",))
+        # Read the id from our own TournamentCreated event: no extra RPC,
+        # and no race with anyone else bumping nextTournamentId
+        created = self.contract.events.TournamentCreated().process_receipt(receipt, errors=DISCARD)
+        on_chain_id = created[0]["args"]["id"]
+        return receipt["transactionHash"].hex(), on_chain_id
 
-    def resolve_tournament(self, tournament_id: int, winner: str, finalists: list[str]) -> str:
+    async def resolve_tournament(self, tournament_id: int, winner: str, finalists: list[str]) -> str:
         """
         Resolve tournament on-chain.
         Handles variable finalist count properly:
@@ -162,56 +509,90 @@ class Blockchain:
         finalist_count = len(real_finalists)
 
         # Pad to exactly 4 addresses
-        padded = list(real_finalists)
-        while len(padded) < 4:
-            padded.append(ZERO_ADDR)
+        padded = [_checksum(f) for f in real_finalists] + [ZERO_ADDR_CS] * (4 - finalist_count)
 
-        fn = self.contract.functions.resolve(
+        fn = self._resolve_fn(
             tournament_id,
-            Web3.to_checksum_address(winner),
-            [Web3.to_checksum_address(f) for f in padded],
+            _checksum(winner),
+            padded,
             finalist_count,
         )
-        return self._send_tx(fn)
+        tx_hash = await self._send_tx(fn)
+        self._invalidate(("stats",), ("tournament", tournament_id))
+        return tx_hash
 
-    def cancel_tournament(self, tournament_id: int) -> str:
-        fn = self.contract.functions.cancel(tournament_id)
-        return self._send_tx(fn)
+    async def cancel_tournament(self, tournament_id: int) -> str:
+        fn = self._cancel_fn(tournament_id)
+        tx_hash = await self._send_tx(fn)
+        self._invalidate(("tournament", tournament_id))
+        return tx_hash
 
-    def set_paused(self, is_paused: bool) -> str:
-        fn = self.contract.functions.setPaused(is_paused)
-        return self._send_tx(fn)
+    async def set_paused(self, is_paused: bool) -> str:
+        fn = self._set_paused_fn(is_paused)
+        tx_hash = await self._send_tx(fn)
+        self._invalidate(("paused",))
+        return tx_hash
 
     # ───────── Verification ─────────
 
-    def verify_player_joined(self, tournament_id: int, player_address: str) -> bool:
+    async def verify_player_joined(self, tournament_id: int, player_address: str) -> bool:
         if not self.contract:
             return False
         try:
-            return self.contract.functions.isPlayer(
-                tournament_id,
-                Web3.to_checksum_address(player_address)
-            ).call()
+            data = SEL_IS_PLAYER + self.w3.codec.encode(
+                ["uint256", "address"], [tournament_id, _checksum(player_address)]
+            )
+            (joined,) = await self._eth_call(data, ["bool"])
+            return joined
         except Exception as e:
             logger.error(f"On-chain verify failed: {e}")
             return False
 
     # ───────── Views ─────────
 
-    def get_tournament(self, tournament_id: int) -> dict:
-        r = self.contract.functions.getTournament(tournament_id).call()
+    @staticmethod
+    def _tournament_dict(r) -> dict:
         return {"arena": r[0], "state": r[1], "entry_fee": r[2],
                 "prize_pool": r[3], "player_count": r[4], "created_at": r[5]}
 
-    def get_stats(self) -> dict:
-        r = self.contract.functions.getStats().call()
+    @staticmethod
+    def _stats_dict(r) -> dict:
         return {"total_burned": r[0], "total_distributed": r[1],
                 "total_completed": r[2], "next_tournament_id": r[3]}
 
-    def is_paused(self) -> bool:
+    async def get_tournament(self, tournament_id: int) -> dict:
+        data = SEL_GET_TOURNAMENT + self.w3.codec.encode(["uint256"], [tournament_id])
+        r = await self._cached(
+            ("tournament", tournament_id),
+            lambda: self._eth_call(data, TOURNAMENT_TYPES),
+        )
+        return self._tournament_dict(r)
+
+    async def get_stats(self) -> dict:
+        r = await self._cached(("stats",), lambda: self._eth_call(SEL_GET_STATS, STATS_TYPES))
+        return self._stats_dict(r)
+
+    async def _fetch_paused(self) -> bool:
+        (paused,) = await self._eth_call(SEL_PAUSED, ["bool"])
+        return paused
+
+    async def is_paused(self) -> bool:
         if not self.contract:
             return False
-        return self.contract.functions.paused().call()
+        return await self._cached(("paused",), self._fetch_paused)
+
+    async def get_dashboard(self, tournament_id: int) -> dict:
+        """Stats + paused flag + one tournament, in a single RPC."""
+        stats, paused, tournament = await self.multicall([
+            self._get_stats_fn(),
+            self._paused_fn(),
+            self._get_tournament_fn(tournament_id),
+        ])
+        return {
+            "stats": self._stats_dict(stats),
+            "paused": paused,
+            "tournament": self._tournament_dict(tournament),
+        }
 
     def calculate_entry_fee_game(self, arena: int) -> int:
         eth_fee = config.ARENA_FEES_ETH.get(arena, 0.002)
@@ -222,8 +603,7 @@ class Blockchain:
         return int(game_amount * (10 ** 18))
 
     def get_game_price_in_eth(self) -> float:
-        import os
-        return float(os.getenv("GAME_PRICE_ETH", "0.000002"))
+        return config.GAME_PRICE_ETH
 
 
 blockchain: Blockchain | None = None
@@ -6,10 +6,24 @@ Claw Game — Configuration
 All env vars match the .env file exactly.
 """
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import ClassVar, Mapping
 
+# ── Entry Fees — used to calculate $GAME amount (shared, read-only) ──
+ARENA_FEES_ETH: Mapping[int, float] = MappingProxyType({
+    0: 0.002,   # Bronze ~$5
+    1: 0.02,    # Silver ~$50
+    2: 0.2,     # Gold   ~$500
+})
+ARENA_FEES_USD: Mapping[int, int] = MappingProxyType({
+    0: 5,
+    1: 50,
+    2: 500,
+})
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Config:
     # ── Server ──
     HOST: str = os.getenv("API_HOST", "0.0.0.0")
@@ -17,9 +31,14 @@ class Config:
 
     # ── Database ──
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./clawgame.db")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = 30       # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800     # seconds before a connection is replaced
 
     # ── Blockchain (.env names match exactly) ──
     RPC_URL: str = os.getenv("BASE_RPC_URL", "https://mainnet.base.org")
+    WS_RPC_URL: str = os.getenv("BASE_WS_URL", "")  # optional, for newHeads
     CHAIN_ID: int = int(os.getenv("CHAIN_ID", "8453"))
     CONTRACT_ADDRESS: str = os.getenv("CONTRACT_ADDRESS", "")
     GAME_TOKEN_ADDRESS: str = os.getenv("GAME_TOKEN_ADDRESS", "")
@@ -36,31 +55,26 @@ class Config:
     REVEAL_DURATION: int = 300      # 5 minutes
     RESOLUTION_PAUSE: int = 30      # 30 seconds between rounds
     CANCEL_DEADLINE: int = 7 * 86400  # 7 days
+    MANAGER_IDLE_INTERVAL: int = 60   # max sleep when no phase deadline is pending
 
     # ── Rate Limiting ──
     RATE_LIMIT_PER_MINUTE: int = 30  # max requests per IP per minute
+    REDIS_URL: str = os.getenv("REDIS_URL", "")  # shared limiter across workers; in-process if empty
+    TRUSTED_PROXY_HOPS: int = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))  # proxies in front that append X-Forwarded-For
+
+    # ── Token price (manual for V1, oracle later) ──
+    GAME_PRICE_ETH: float = float(os.getenv("GAME_PRICE_ETH", "0.000002"))
 
     # ── Entry Fees (ETH) — used to calculate $GAME amount ──
-    ARENA_FEES_ETH: dict = field(default_factory=dict)
-    ARENA_FEES_USD: dict = field(default_factory=dict)
+    ARENA_FEES_ETH: ClassVar[Mapping[int, float]] = ARENA_FEES_ETH
+    ARENA_FEES_USD: ClassVar[Mapping[int, int]] = ARENA_FEES_USD
 
     def __post_init__(self):
         # Handle PRIVATE_KEY with or without 0x
         pk = os.getenv("PRIVATE_KEY", "")
         if pk and not pk.startswith("0x"):
             pk = "0x" + pk
-        self.OWNER_PRIVATE_KEY = pk
-
-        self.ARENA_FEES_ETH = {
-            0: 0.002,   # Bronze ~$5
-            1: 0.02,    # Silver ~$50
-            2: 0.2,     # Gold   ~$500
-        }
-        self.ARENA_FEES_USD = {
-            0: 5,
-            1: 50,
-            2: 500,
-        }
+        object.__setattr__(self, "OWNER_PRIVATE_KEY", pk)
 
 
 config = Config()
@@ -7,19 +7,22 @@ Handles:
 - Elimination logic (50% per round)
 - Tournament state machine
 """
-import hashlib
-import json
+import hmac
 from datetime import datetime, timedelta
-from typing import Optional
-from sqlalchemy import select, and_
+from functools import partial
+from Crypto.Hash import keccak
+from sqlalchemy import select, update, case, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import (
-    Tournament, TournamentEntry, Round, RoundCommit,
+    Agent, Tournament, TournamentEntry, Round, RoundCommit,
     TournamentState, GameVariant
 )
 from config import config
 
+# Ethereum keccak256 (NOT hashlib.sha3_256 — NIST SHA3 pads differently)
+keccak256 = partial(keccak.new, digest_bits=256)
+
 
 class GameEngine:
 
@@ -27,22 +30,25 @@ class GameEngine:
     #          COMMIT-REVEAL
     # ═══════════════════════════════════════
 
+    @staticmethod
+    def _commit_digest(bid: int, salt: str) -> bytes:
+        bid_bytes = bid.to_bytes(2, "big")
+        salt_bytes = bytes.fromhex(salt.removeprefix("0x"))
+        return keccak256(data=bid_bytes + salt_bytes).digest()
+
     @staticmethod
     def compute_commit_hash(bid: int, salt: str) -> str:
         """
         Compute keccak256(abi.encodePacked(uint16(bid), bytes32(salt)))
-        Uses sha3_256 which IS keccak256 in hashlib.
+        Matches Web3.solidity_keccak(['uint16', 'bytes32'], [bid, salt]).
         """
-        bid_bytes = bid.to_bytes(2, "big")
-        salt_bytes = bytes.fromhex(salt.replace("0x", ""))
-        data = bid_bytes + salt_bytes
-        return "0x" + hashlib.sha3_256(data).hexdigest()
+        return "0x" + GameEngine._commit_digest(bid, salt).hex()
 
     @staticmethod
     def verify_reveal(commit_hash: str, bid: int, salt: str) -> bool:
-        """Verify that bid + salt matches the original commit hash"""
-        computed = GameEngine.compute_commit_hash(bid, salt)
-        return computed.lower() == commit_hash.lower()
+        """Verify that bid + salt matches the original commit hash (constant-time)"""
+        expected = bytes.fromhex(commit_hash.removeprefix("0x"))
+        return hmac.compare_digest(GameEngine._commit_digest(bid, salt), expected)
 
     # ═══════════════════════════════════════
     #       PLAYER-DERIVED RANDOMNESS
@@ -58,10 +64,10 @@ class GameEngine:
         Since every player contributes a salt, no single player
         can predict or manipulate the result.
         """
-        combined = b""
-        for salt in sorted(salts):  # Sort for determinism
-            combined += bytes.fromhex(salt.replace("0x", ""))
-        hash_bytes = hashlib.sha3_256(combined).digest()
+        # Decode once, sort the raw bytes for determinism, hash one buffer
+        raw = [bytes.fromhex(salt.removeprefix("0x")) for salt in salts]
+        raw.sort()
+        hash_bytes = keccak256(data=b"".join(raw)).digest()
         # +1 to get range 1-1000 instead of 0-999
         secret = (int.from_bytes(hash_bytes[:4], "big") % 1000) + 1
         return secret
@@ -77,10 +83,17 @@ class GameEngine:
         variant: int = GameVariant.CLASSIC
     ) -> dict[str, int]:
         """Calculate distance from secret for each player"""
-        distances = {}
-        for addr, bid in bids.items():
-            distances[addr] = abs(bid - secret)
-        return distances
+        return {addr: abs(bid - secret) for addr, bid in bids.items()}
+
+    @staticmethod
+    def _rank(distances: dict[str, int], variant: int) -> list[str]:
+        """
+        Addresses best-first: lower distance (Classic) / higher distance
+        (Inverse), ties broken by lower wallet address.
+        """
+        if variant == GameVariant.INVERSE:
+            return sorted(distances, key=lambda a: (-distances[a], a))
+        return sorted(distances, key=lambda a: (distances[a], a))
 
     @staticmethod
     def eliminate(
@@ -98,22 +111,9 @@ class GameEngine:
         if len(distances) <= 5:
             return list(distances.keys()), []
 
-        if variant == GameVariant.INVERSE:
-            sorted_players = sorted(
-                distances.items(),
-                key=lambda x: (-x[1], x[0])
-            )
-        else:
-            sorted_players = sorted(
-                distances.items(),
-                key=lambda x: (x[1], x[0])
-            )
-
-        survive_count = (len(sorted_players) + 1) // 2
-        survivors = [addr for addr, _ in sorted_players[:survive_count]]
-        eliminated = [addr for addr, _ in sorted_players[survive_count:]]
-
-        return survivors, eliminated
+        ranked = GameEngine._rank(distances, variant)
+        survive_count = (len(ranked) + 1) // 2
+        return ranked[:survive_count], ranked[survive_count:]
 
     @staticmethod
     def determine_final_ranking(
@@ -125,11 +125,7 @@ class GameEngine:
         Returns addresses ordered: [winner, #2, #3, #4, ...]
         May return fewer than 5 if fewer players remain.
         """
-        if variant == GameVariant.INVERSE:
-            ranked = sorted(distances.items(), key=lambda x: (-x[1], x[0]))
-        else:
-            ranked = sorted(distances.items(), key=lambda x: (x[1], x[0]))
-        return [addr for addr, _ in ranked]
+        return GameEngine._rank(distances, variant)
 
     # ═══════════════════════════════════════
     #         TOURNAMENT FLOW
@@ -138,12 +134,12 @@ class GameEngine:
     @staticmethod
     async def start_tournament(db: AsyncSession, tournament_id: int) -> Round:
         """Initialize first round when 100 players registered"""
+        now = datetime.utcnow()
         tournament = await db.get(Tournament, tournament_id)
         tournament.state = TournamentState.ACTIVE
-        tournament.started_at = datetime.utcnow()
+        tournament.started_at = now
         tournament.current_round = 1
 
-        now = datetime.utcnow()
         round1 = Round(
             tournament_id=tournament_id,
             round_number=1,
@@ -180,7 +176,7 @@ class GameEngine:
         return new_round
 
     @staticmethod
-    async def open_reveal_phase(db: AsyncSession, round_obj: Round):
+    async def open_reveal_phase(db: AsyncSession, round_obj: Round) -> None:
         """Transition from commit to reveal phase"""
         now = datetime.utcnow()
         round_obj.reveal_deadline = now + timedelta(seconds=config.REVEAL_DURATION)
@@ -199,30 +195,36 @@ class GameEngine:
         4. Eliminate 50%
         5. Return results
         """
+        now = datetime.utcnow()
         tournament = await db.get(Tournament, round_obj.tournament_id)
 
-        result = await db.execute(
-            select(RoundCommit).where(RoundCommit.round_id == round_obj.id)
+        # Stream plain rows, not ORM objects — results are written back in bulk
+        result = await db.stream(
+            select(
+                RoundCommit.id, RoundCommit.agent_address,
+                RoundCommit.revealed, RoundCommit.bid, RoundCommit.salt,
+            ).where(RoundCommit.round_id == round_obj.id)
         )
-        commits = result.scalars().all()
 
+        commits = []  # (commit id, agent address)
         revealed_bids = {}
         revealed_salts = []
         non_revealers = []
 
-        for c in commits:
+        async for c in result:
+            commits.append((c.id, c.agent_address))
             if c.revealed and c.bid is not None and c.salt is not None:
                 revealed_bids[c.agent_address] = c.bid
                 revealed_salts.append(c.salt)
             else:
                 non_revealers.append(c.agent_address)
-                c.eliminated = True
 
         if not revealed_salts:
             # Edge case: nobody revealed — cancel round
+            await GameEngine._store_commit_results(db, commits, {}, set(non_revealers))
             round_obj.secret_number = 0
             round_obj.players_end = 0
-            round_obj.resolved_at = datetime.utcnow()
+            round_obj.resolved_at = now
             return {"type": "no_reveals", "survivors": [], "eliminated": non_revealers}
 
         secret = GameEngine.compute_secret(revealed_salts)
@@ -232,17 +234,14 @@ class GameEngine:
             revealed_bids, secret, tournament.variant
         )
 
-        for c in commits:
-            if c.agent_address in distances:
-                c.distance = distances[c.agent_address]
-
         # Check if final round (≤5 revealed players)
         if len(revealed_bids) <= 5:
+            await GameEngine._store_commit_results(db, commits, distances, set(non_revealers))
             ranking = GameEngine.determine_final_ranking(
                 distances, tournament.variant
             )
             round_obj.players_end = len(ranking)
-            round_obj.resolved_at = datetime.utcnow()
+            round_obj.resolved_at = now
             return {
                 "type": "final",
                 "secret": secret,
@@ -253,26 +252,21 @@ class GameEngine:
         survivors, eliminated = GameEngine.eliminate(
             distances, tournament.variant
         )
+        await GameEngine._store_commit_results(
+            db, commits, distances, set(eliminated) | set(non_revealers)
+        )
 
-        for c in commits:
-            if c.agent_address in eliminated:
-                c.eliminated = True
-
-        for addr in eliminated + non_revealers:
-            entry_result = await db.execute(
-                select(TournamentEntry).where(
-                    and_(
-                        TournamentEntry.tournament_id == tournament.id,
-                        TournamentEntry.agent_address == addr
-                    )
-                )
-            )
-            entry = entry_result.scalar_one_or_none()
-            if entry:
-                entry.is_alive = False
+        await db.execute(
+            update(TournamentEntry)
+            .where(and_(
+                TournamentEntry.tournament_id == tournament.id,
+                TournamentEntry.agent_address.in_(eliminated + non_revealers),
+            ))
+            .values(is_alive=False)
+        )
 
         round_obj.players_end = len(survivors)
-        round_obj.resolved_at = datetime.utcnow()
+        round_obj.resolved_at = now
         tournament.state = TournamentState.RESOLVING
 
         return {
@@ -283,45 +277,60 @@ class GameEngine:
             "non_revealers": non_revealers,
         }
 
+    @staticmethod
+    async def _store_commit_results(
+        db: AsyncSession,
+        commits: list[tuple[int, str]],
+        distances: dict[str, int],
+        eliminated: set[str],
+    ) -> None:
+        """Write distance + eliminated for every commit in one executemany."""
+        if not commits:
+            return
+        await db.execute(update(RoundCommit), [
+            {"id": commit_id, "distance": distances.get(addr), "eliminated": addr in eliminated}
+            for commit_id, addr in commits
+        ])
+
     @staticmethod
     async def finish_tournament(
         db: AsyncSession,
         tournament_id: int,
         ranking: list[str],
-    ):
+    ) -> None:
         """Mark tournament as finished + store results."""
         tournament = await db.get(Tournament, tournament_id)
         tournament.state = TournamentState.FINISHED
         tournament.finished_at = datetime.utcnow()
         tournament.winner_address = ranking[0] if ranking else None
-        tournament.finalist_addresses = json.dumps(ranking[1:5] if len(ranking) > 1 else [])
-
-        for i, addr in enumerate(ranking[:5]):
-            entry_result = await db.execute(
-                select(TournamentEntry).where(
-                    and_(
-                        TournamentEntry.tournament_id == tournament_id,
-                        TournamentEntry.agent_address == addr
-                    )
-                )
-            )
-            entry = entry_result.scalar_one_or_none()
-            if entry:
-                entry.final_rank = i + 1
-
-        if ranking:
-            from sqlalchemy import select as sel
-            winner_entry_result = await db.execute(
-                select(TournamentEntry).where(
-                    and_(
-                        TournamentEntry.tournament_id == tournament_id,
-                        TournamentEntry.agent_address == ranking[0]
-                    )
-                )
-            )
-            winner_entry = winner_entry_result.scalar_one_or_none()
-            if winner_entry:
-                from models import Agent
-                agent = await db.get(Agent, winner_entry.agent_id)
-                if agent:
-                    agent.tournaments_won += 1
+        tournament.finalist_addresses = ranking[1:5]
+
+        if not ranking:
+            return
+
+        top = ranking[:5]
+        await db.execute(
+            update(TournamentEntry)
+            .where(and_(
+                TournamentEntry.tournament_id == tournament_id,
+                TournamentEntry.agent_address.in_(top),
+            ))
+            .values(final_rank=case(
+                {addr: i + 1 for i, addr in enumerate(top)},
+                value=TournamentEntry.agent_address,
+            ))
+        )
+
+        # Credit the win in SQL: the agent id comes from the winner's entry in-query
+        await db.execute(
+            update(Agent)
+            .where(Agent.id == (
+                select(TournamentEntry.agent_id)
+                .where(and_(
+                    TournamentEntry.tournament_id == tournament_id,
+                    TournamentEntry.agent_address == ranking[0],
+                ))
+                .scalar_subquery()
+            ))
+            .values(tournaments_won=Agent.tournaments_won + 1)
+        )
@@ -13,26 +13,36 @@ Fixes from audit:
 - /contract endpoint for frontend config
 """
 import os
-import json
 import secrets
 import asyncio
+import base64
+import hashlib
 import logging
+import math
 import time
-from collections import defaultdict
+import orjson
 from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
+from itertools import groupby
 
-from fastapi import FastAPI, HTTPException, Depends, Header, Request
+from cachetools import LRUCache, TTLCache
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, Field
-from sqlalchemy import select, and_, func, desc
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy import select, update, and_, or_, exists, func, desc, null, bindparam, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import make_transient_to_detached
 
 from config import config
 from models import (
     Base, Agent, Tournament, TournamentEntry, Round, RoundCommit,
-    TournamentState, ArenaType, GameVariant,
+    TournamentState, ArenaType, GameVariant, create_missing_indexes, make_engines,
+    migrate_join_commits, migrate_json_columns, migrate_wei_columns, write_transaction, tournaments_query,
 )
 from game_engine import GameEngine
 from blockchain import get_blockchain
@@ -45,17 +55,64 @@ logger = logging.getLogger(__name__)
 #                    DATABASE
 # ═══════════════════════════════════════════════════════
 
-engine = create_async_engine(config.DATABASE_URL, echo=False)
+def _engine_options(url: str) -> dict:
+    """
+    Explicit pool sizing for server databases — the defaults (5 + 10) starve
+    under modest concurrency. SQLite pools are sized by make_engines.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    options = {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"statement_cache_size": 1024, "prepared_statement_cache_size": 512}
+    return options
+
+engine, read_engine = make_engines(
+    config.DATABASE_URL, read_pool_size=config.DB_POOL_SIZE,
+    echo=False, **_engine_options(config.DATABASE_URL),
+)
 SessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+ReadSessionLocal = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
 
 async def get_db():
-    async with SessionLocal() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+    async with SessionLocal() as session, write_transaction(session):
+        yield session
+
+async def get_db_ro():
+    """For read-only endpoints: no COMMIT round-trip, just close (rollback) on exit."""
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+# Hot-path statements built once; lambda_stmt caches them by code location,
+# so per-request execution skips construction and cache-key generation
+_SEL_AGENT_BY_KEY = lambda_stmt(lambda: select(Agent).where(Agent.api_key == bindparam("key")))
+# Plain select, not lambda_stmt: the closure would capture the IntEnum
+# members, which aiosqlite can't bind. No per-request params, so built once.
+_SEL_CURRENT_TOURNAMENTS = tournaments_query().where(
+    Tournament.state.in_([int(s) for s in (
+        TournamentState.OPEN, TournamentState.ACTIVE,
+        TournamentState.COMMIT, TournamentState.REVEAL,
+        TournamentState.RESOLVING,
+    )])
+).order_by(Tournament.arena)
+_SEL_ROUND_BY_T_NUM = lambda_stmt(lambda: select(Round).where(and_(
+    Round.tournament_id == bindparam("tid"),
+    Round.round_number == bindparam("num"),
+)))
+# Dialect insert() constructs that support ON CONFLICT
+_UPSERT_INSERT = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+_SEL_COMMIT_BY_R_ADDR = lambda_stmt(lambda: select(RoundCommit).where(and_(
+    RoundCommit.round_id == bindparam("rid"),
+    RoundCommit.agent_address == bindparam("addr"),
+)))
 
 
 # ═══════════════════════════════════════════════════════
@@ -63,20 +120,148 @@ async def get_db():
 # ═══════════════════════════════════════════════════════
 
 class RateLimiter:
+    """
+    Token bucket per IP: capacity max_per_minute, refilled continuously.
+    O(1) per check; idle IPs (bucket back to full) are swept once a minute,
+    and an LRU cap bounds memory against bursts of new addresses.
+    """
+    SWEEP_INTERVAL = 60  # seconds
+    MAX_TRACKED_IPS = 100_000
+
     def __init__(self, max_per_minute: int = 30):
         self.max_per_minute = max_per_minute
-        self.requests: dict[str, list[float]] = defaultdict(list)
+        self.refill_rate = max_per_minute / 60  # tokens per second
+        self.buckets: LRUCache = LRUCache(maxsize=self.MAX_TRACKED_IPS)  # ip -> (tokens, last_refill)
+        self._next_sweep = time.monotonic() + self.SWEEP_INTERVAL
+
+    async def retry_after(self, ip: str) -> float:
+        """0 if the request may proceed, else seconds until the next token."""
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+        tokens, last = self.buckets.get(ip, (self.max_per_minute, now))
+        tokens = min(self.max_per_minute, tokens + (now - last) * self.refill_rate)
+        if tokens < 1:
+            self.buckets[ip] = (tokens, now)
+            return (1 - tokens) / self.refill_rate
+        self.buckets[ip] = (tokens - 1, now)
+        return 0
+
+    def _sweep(self, now: float):
+        # A bucket idle for a full minute has refilled — dropping it is lossless
+        idle = now - self.SWEEP_INTERVAL
+        for ip in [ip for ip, (_, last) in list(self.buckets.items()) if last <= idle]:
+            del self.buckets[ip]
+        self._next_sweep = now + self.SWEEP_INTERVAL
+
+
+# Sliding window over a ZSET of request timestamps; atomic per key.
+# Returns 0 when admitted, else ms until the oldest entry leaves the window.
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+if redis.call('ZCARD', key) >= limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    return math.max(1, tonumber(oldest[2]) + window - now)
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('PEXPIRE', key, window)
+return 0
+"""
+
 
-    def is_limited(self, ip: str) -> bool:
-        now = time.time()
-        window = now - 60
-        self.requests[ip] = [t for t in self.requests[ip] if t > window]
-        if len(self.requests[ip]) >= self.max_per_minute:
-            return True
-        self.requests[ip].append(now)
-        return False
+class RedisRateLimiter:
+    """
+    Shared limiter for multi-worker deployments: every worker counts
+    against the same Redis window, and idle keys expire on their own.
+    Fails open if Redis is unreachable.
+    """
+    WINDOW_MS = 60_000
 
-rate_limiter = RateLimiter(config.RATE_LIMIT_PER_MINUTE)
+    def __init__(self, client: aioredis.Redis, max_per_minute: int = 30):
+        self.max_per_minute = max_per_minute
+        self._script = client.register_script(SLIDING_WINDOW_LUA)
+
+    async def retry_after(self, ip: str) -> float:
+        now_ms = int(time.time() * 1000)
+        member = f"{now_ms}-{secrets.token_hex(4)}"
+        try:
+            wait_ms = await self._script(
+                keys=[f"rl:{ip}"],
+                args=[now_ms, self.WINDOW_MS, self.max_per_minute, member],
+            )
+        except RedisError as e:
+            logger.warning(f"Rate limiter unavailable, allowing request: {e}")
+            return 0
+        return int(wait_ms) / 1000
+
+redis_client = aioredis.from_url(config.REDIS_URL) if config.REDIS_URL else None
+rate_limiter = (
+    RedisRateLimiter(redis_client, config.RATE_LIMIT_PER_MINUTE) if redis_client
+    else RateLimiter(config.RATE_LIMIT_PER_MINUTE)
+)
+
+
+# ═══════════════════════════════════════════════════════
+#                  RESPONSE CACHE
+# ═══════════════════════════════════════════════════════
+
+class ResponseCache:
+    """
+    Cache-aside for hot read endpoints. Uses Redis when configured (shared
+    across workers), otherwise a bounded per-process TTLCache. Cache errors
+    never fail a request — they just fall through to the database.
+    """
+    PREFIX = "cache:"
+    LOCAL_MAXSIZE = 1024
+    LOCAL_TTL = 300  # eviction backstop; each entry also carries its own expiry
+
+    def __init__(self, client: aioredis.Redis | None = None):
+        self.client = client
+        # key -> (expires_at, value)
+        self._local: TTLCache = TTLCache(maxsize=self.LOCAL_MAXSIZE, ttl=self.LOCAL_TTL)
+
+    async def get(self, key: str):
+        if self.client is None:
+            hit = self._local.get(key)
+            if hit and hit[0] > time.monotonic():
+                return hit[1]
+            return None
+        try:
+            raw = await self.client.get(self.PREFIX + key)
+        except RedisError as e:
+            logger.warning(f"Cache get failed: {e}")
+            return None
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value, ttl: int):
+        if self.client is None:
+            self._local[key] = (time.monotonic() + ttl, value)
+            return
+        try:
+            await self.client.set(self.PREFIX + key, orjson.dumps(value), ex=ttl)
+        except RedisError as e:
+            logger.warning(f"Cache set failed: {e}")
+
+    async def delete_prefix(self, *prefixes: str):
+        if self.client is None:
+            for key in [k for k in self._local if k.startswith(prefixes)]:
+                self._local.pop(key, None)
+            return
+        try:
+            for prefix in prefixes:
+                keys = [k async for k in self.client.scan_iter(match=f"{self.PREFIX}{prefix}*")]
+                if keys:
+                    await self.client.delete(*keys)
+        except RedisError as e:
+            logger.warning(f"Cache invalidation failed: {e}")
+
+response_cache = ResponseCache(redis_client)
+LEADERBOARD_TTL = 60  # seconds
+STATS_TTL = 60        # seconds
 
 
 # ═══════════════════════════════════════════════════════
@@ -87,15 +272,22 @@ rate_limiter = RateLimiter(config.RATE_LIMIT_PER_MINUTE)
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_missing_indexes)
+        await conn.run_sync(migrate_join_commits)
+        await conn.run_sync(migrate_json_columns)
+        await conn.run_sync(migrate_wei_columns)
     logger.info("Claw Game API v1.1 started")
     task = asyncio.create_task(tournament_manager())
     yield
     task.cancel()
+    if redis_client:
+        await redis_client.aclose()
 
 app = FastAPI(
     title="Claw Game API",
     description="PvP Battle Royale Arena for AI Agents",
     version="1.1.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -107,15 +299,32 @@ app.add_middleware(
 )
 
 
+def client_ip(request: Request) -> str:
+    """
+    Caller IP for rate limiting. Behind TRUSTED_PROXY_HOPS proxies, the
+    address our outermost proxy saw is that many entries from the right of
+    X-Forwarded-For; anything further left is client-supplied and spoofable.
+    """
+    hops = config.TRUSTED_PROXY_HOPS
+    if hops:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            chain = [part.strip() for part in forwarded.split(",")]
+            return chain[-hops] if len(chain) >= hops else chain[0]
+    return request.client.host if request.client else "unknown"
+
+
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
     if request.url.path in ("/health", "/", "/api/v1/health"):
         return await call_next(request)
-    ip = request.client.host if request.client else "unknown"
-    if rate_limiter.is_limited(ip):
-        return JSONResponse(
+    ip = client_ip(request)
+    wait = await rate_limiter.retry_after(ip)
+    if wait:
+        return ORJSONResponse(
             status_code=429,
-            content={"detail": "Rate limit exceeded. Max 30 requests per minute."},
+            content={"detail": f"Rate limit exceeded. Max {config.RATE_LIMIT_PER_MINUTE} requests per minute."},
+            headers={"Retry-After": str(math.ceil(wait))},
         )
     return await call_next(request)
 
@@ -124,17 +333,43 @@ async def rate_limit_middleware(request: Request, call_next):
 #                  AUTH HELPER
 # ═══════════════════════════════════════════════════════
 
+# api_key -> detached Agent snapshot; saves a SELECT on every authed call
+_AGENT_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+def _agent_snapshot(agent: Agent) -> Agent:
+    snapshot = Agent(**{c.key: getattr(agent, c.key) for c in Agent.__table__.columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+async def _load_agent(db: AsyncSession, x_api_key: str) -> Agent:
+    snapshot = _AGENT_CACHE.get(x_api_key)
+    if snapshot is not None:
+        # Attach a copy to this session without a SELECT; writes still flush
+        agent = await db.merge(snapshot, load=False)
+    else:
+        result = await db.execute(_SEL_AGENT_BY_KEY, {"key": x_api_key})
+        agent = result.scalar_one_or_none()
+        if not agent:
+            raise HTTPException(401, "Invalid API key")
+        _AGENT_CACHE[x_api_key] = _agent_snapshot(agent)
+    if agent.status != "active":
+        raise HTTPException(403, f"Agent is {agent.status}")
+    return agent
+
+
 async def get_agent(
     x_api_key: str = Header(..., alias="X-API-Key"),
     db: AsyncSession = Depends(get_db),
 ) -> Agent:
-    result = await db.execute(select(Agent).where(Agent.api_key == x_api_key))
-    agent = result.scalar_one_or_none()
-    if not agent:
-        raise HTTPException(401, "Invalid API key")
-    if agent.status != "active":
-        raise HTTPException(403, f"Agent is {agent.status}")
-    return agent
+    return await _load_agent(db, x_api_key)
+
+
+async def get_agent_ro(
+    x_api_key: str = Header(..., alias="X-API-Key"),
+    db: AsyncSession = Depends(get_db_ro),
+) -> Agent:
+    """Auth without opening a write transaction, for handlers that open their own."""
+    return await _load_agent(db, x_api_key)
 
 
 # ═══════════════════════════════════════════════════════
@@ -158,43 +393,60 @@ class RevealRequest(BaseModel):
 #                 HELPERS
 # ═══════════════════════════════════════════════════════
 
+def etag_response(request: Request, data) -> Response:
+    """
+    JSON response with a strong ETag over the body; 304 if the client
+    already has it. Polling clients skip the transfer when nothing changed.
+    """
+    body = orjson.dumps(data)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "max-age=2"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (t.strip() for t in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Enum names resolved once — _format_tournament runs per row on every list
+_ARENA_NAME = {a.value: a.name for a in ArenaType}
+_STATE_NAME = {st.value: st.name for st in TournamentState}
+_VARIANT_NAME = {v.value: v.name for v in GameVariant}
+_STATE_PHASE = {
+    TournamentState.OPEN: "registration",
+    TournamentState.ACTIVE: "active",
+    TournamentState.COMMIT: "commit",
+    TournamentState.REVEAL: "reveal",
+    TournamentState.RESOLVING: "resolving",
+    TournamentState.FINISHED: "finished",
+    TournamentState.CANCELLED: "cancelled",
+}
+_ARENA_FEE_USD = dict(config.ARENA_FEES_USD)
+_MAX_PLAYERS = config.MAX_PLAYERS
+
 def _format_tournament(t: Tournament) -> dict:
-    arena_usd = config.ARENA_FEES_USD.get(t.arena, 5)
     return {
         "id": t.id,
         "chain_id": t.chain_id,
         "arena": t.arena,
-        "arena_name": ArenaType(t.arena).name,
+        "arena_name": _ARENA_NAME[t.arena],
         "state": t.state,
-        "state_name": TournamentState(t.state).name,
-        "phase": _state_to_phase(t.state),
+        "state_name": _STATE_NAME[t.state],
+        "phase": _STATE_PHASE.get(t.state, "unknown"),
         "variant": t.variant,
-        "variant_name": GameVariant(t.variant).name,
+        "variant_name": _VARIANT_NAME[t.variant],
         "entry_fee_game": str(t.entry_fee_game),
-        "entry_fee_usd": arena_usd,
+        "entry_fee_usd": _ARENA_FEE_USD.get(t.arena, 5),
         "player_count": t.player_count,
-        "max_players": config.MAX_PLAYERS,
+        "max_players": _MAX_PLAYERS,
         "prize_pool": str(t.prize_pool),
         "current_round": t.current_round,
         "round": t.current_round,
-        "phase_deadline": t.phase_deadline.isoformat() if t.phase_deadline else None,
-        "created_at": t.created_at.isoformat(),
+        "phase_deadline": t.phase_deadline,
+        "created_at": t.created_at,
         "winner": t.winner_address,
-        "finalists": json.loads(t.finalist_addresses) if t.finalist_addresses else [],
-        "finished_at": t.finished_at.isoformat() if t.finished_at else None,
-    }
-
-def _state_to_phase(state: int) -> str:
-    mapping = {
-        TournamentState.OPEN: "registration",
-        TournamentState.ACTIVE: "active",
-        TournamentState.COMMIT: "commit",
-        TournamentState.REVEAL: "reveal",
-        TournamentState.RESOLVING: "resolving",
-        TournamentState.FINISHED: "finished",
-        TournamentState.CANCELLED: "cancelled",
+        "finalists": t.finalist_addresses or [],
+        "finished_at": t.finished_at,
     }
-    return mapping.get(state, "unknown")
 
 
 # ═══════════════════════════════════════════════════════
@@ -204,9 +456,9 @@ def _state_to_phase(state: int) -> str:
 @app.post("/api/v1/agents/register")
 async def register_agent(req: RegisterRequest, db: AsyncSession = Depends(get_db)):
     existing = await db.execute(
-        select(Agent).where(Agent.wallet_address == req.wallet_address.lower())
+        select(exists().where(Agent.wallet_address == req.wallet_address.lower()))
     )
-    if existing.scalar_one_or_none():
+    if existing.scalar():
         raise HTTPException(409, "Agent already registered with this wallet")
 
     api_key = secrets.token_hex(32)
@@ -233,25 +485,13 @@ async def register_agent(req: RegisterRequest, db: AsyncSession = Depends(get_db
 # ═══════════════════════════════════════════════════════
 
 @app.get("/api/v1/tournaments/current")
-async def get_current_tournaments(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Tournament).where(
-            Tournament.state.in_([
-                TournamentState.OPEN, TournamentState.ACTIVE,
-                TournamentState.COMMIT, TournamentState.REVEAL,
-                TournamentState.RESOLVING,
-            ])
-        ).order_by(Tournament.arena)
-    )
+async def get_current_tournaments(request: Request, db: AsyncSession = Depends(get_db_ro)):
+    result = await db.execute(_SEL_CURRENT_TOURNAMENTS)
     tournaments = result.scalars().all()
-    return {"tournaments": [_format_tournament(t) for t in tournaments]}
+    return etag_response(request, {"tournaments": [_format_tournament(t) for t in tournaments]})
 
 
-@app.post("/api/v1/tournaments/{tournament_id}/join")
-async def join_tournament(
-    tournament_id: int, req: CommitRequest,
-    agent: Agent = Depends(get_agent), db: AsyncSession = Depends(get_db),
-):
+async def _joinable_tournament(db: AsyncSession, tournament_id: int, agent: Agent) -> Tournament:
     tournament = await db.get(Tournament, tournament_id)
     if not tournament:
         raise HTTPException(404, "Tournament not found")
@@ -261,19 +501,29 @@ async def join_tournament(
         raise HTTPException(400, "Tournament full")
 
     existing = await db.execute(
-        select(TournamentEntry).where(and_(
+        select(exists().where(and_(
             TournamentEntry.tournament_id == tournament_id,
             TournamentEntry.agent_id == agent.id,
-        ))
+        )))
     )
-    if existing.scalar_one_or_none():
+    if existing.scalar():
         raise HTTPException(409, "Already joined this tournament")
+    return tournament
+
 
-    # On-chain payment verification (best-effort)
+@app.post("/api/v1/tournaments/{tournament_id}/join")
+async def join_tournament(
+    tournament_id: int, req: CommitRequest, background_tasks: BackgroundTasks,
+    agent: Agent = Depends(get_agent_ro), db_ro: AsyncSession = Depends(get_db_ro),
+):
+    tournament = await _joinable_tournament(db_ro, tournament_id, agent)
+
+    # On-chain payment verification (best-effort) — before the write
+    # transaction, so a slow RPC never holds SQLite's single writer
     try:
         bc = get_blockchain()
         if bc.contract and tournament.chain_id is not None:
-            paid = bc.verify_player_joined(tournament.chain_id, agent.wallet_address)
+            paid = await bc.verify_player_joined(tournament.chain_id, agent.wallet_address)
             if not paid:
                 raise HTTPException(402, "Entry fee not paid on-chain. Call join() or joinWithETH() on the contract first.")
     except HTTPException:
@@ -281,6 +531,18 @@ async def join_tournament(
     except Exception as e:
         logger.warning(f"On-chain verification skipped: {e}")
 
+    async with SessionLocal() as db, write_transaction(db):
+        # Re-check under the write lock: state and slots may have moved during the RPC
+        agent = await db.merge(agent, load=False)
+        tournament = await _joinable_tournament(db, tournament_id, agent)
+        return await _add_entry(db, tournament, agent, req, background_tasks)
+
+
+async def _add_entry(
+    db: AsyncSession, tournament: Tournament, agent: Agent,
+    req: CommitRequest, background_tasks: BackgroundTasks,
+) -> dict:
+    tournament_id = tournament.id
     entry = TournamentEntry(
         tournament_id=tournament_id, agent_id=agent.id,
         agent_address=agent.wallet_address, creator_address=agent.creator_address,
@@ -289,24 +551,31 @@ async def join_tournament(
     tournament.player_count += 1
 
     entry_commit = RoundCommit(
-        round_id=0, agent_address=agent.wallet_address, commit_hash=req.commit_hash,
+        round_id=0, tournament_id=tournament_id,
+        agent_address=agent.wallet_address, commit_hash=req.commit_hash,
     )
     db.add(entry_commit)
 
     started = False
     if tournament.player_count >= config.MAX_PLAYERS:
         round1 = await GameEngine.start_tournament(db, tournament_id)
-        result = await db.execute(select(RoundCommit).where(RoundCommit.round_id == 0))
-        for c in result.scalars().all():
-            check = await db.execute(select(TournamentEntry).where(and_(
-                TournamentEntry.tournament_id == tournament_id,
-                TournamentEntry.agent_address == c.agent_address,
-            )))
-            if check.scalar_one_or_none():
-                c.round_id = round1.id
+        # Move every entrant's join-time commit onto round 1 in one statement.
+        # Only this tournament's: an entrant may have joined other open arenas
+        await db.execute(
+            update(RoundCommit)
+            .where(and_(
+                RoundCommit.round_id == 0,
+                RoundCommit.tournament_id == tournament_id,
+            ))
+            .values(round_id=round1.id)
+        )
         started = True
+        # New phase deadline + an arena needing a fresh OPEN tournament;
+        # runs after the response, i.e. after the join has committed
+        background_tasks.add_task(_wake.set)
 
-    agent.tournaments_played += 1
+    # SQL-side increment: the cached agent's counter may be a few seconds stale
+    agent.tournaments_played = Agent.tournaments_played + 1
     return {
         "status": "joined", "tournament_id": tournament_id,
         "player_count": tournament.player_count, "max_players": config.MAX_PLAYERS,
@@ -325,38 +594,39 @@ async def submit_commit(
     if not tournament:
         raise HTTPException(404, "Tournament not found")
     if tournament.state != TournamentState.COMMIT:
-        raise HTTPException(400, f"Not in commit phase (current: {TournamentState(tournament.state).name})")
+        raise HTTPException(400, f"Not in commit phase (current: {_STATE_NAME[tournament.state]})")
 
-    entry = await db.execute(select(TournamentEntry).where(and_(
+    alive = await db.execute(select(exists().where(and_(
         TournamentEntry.tournament_id == tournament_id,
         TournamentEntry.agent_address == agent.wallet_address,
         TournamentEntry.is_alive == True,
-    )))
-    if not entry.scalar_one_or_none():
+    ))))
+    if not alive.scalar():
         raise HTTPException(403, "Not alive in this tournament")
 
     if tournament.phase_deadline and datetime.utcnow() > tournament.phase_deadline:
         raise HTTPException(400, "Commit phase ended")
 
-    round_result = await db.execute(select(Round).where(and_(
-        Round.tournament_id == tournament_id,
-        Round.round_number == tournament.current_round,
-    )))
+    round_result = await db.execute(
+        _SEL_ROUND_BY_T_NUM, {"tid": tournament_id, "num": tournament.current_round}
+    )
     current_round = round_result.scalar_one_or_none()
     if not current_round:
         raise HTTPException(500, "Round not found")
 
-    existing = await db.execute(select(RoundCommit).where(and_(
-        RoundCommit.round_id == current_round.id,
-        RoundCommit.agent_address == agent.wallet_address,
-    )))
-    if existing.scalar_one_or_none():
+    # Insert-or-nothing against ix_commit_r_addr: one round-trip, no check/insert race
+    insert = _UPSERT_INSERT[engine.dialect.name]
+    inserted = await db.execute(
+        insert(RoundCommit)
+        .values(round_id=current_round.id, agent_address=agent.wallet_address, commit_hash=req.commit_hash)
+        .on_conflict_do_nothing(
+            index_elements=[RoundCommit.round_id, RoundCommit.agent_address],
+            index_where=RoundCommit.round_id > 0,
+        )
+        .returning(RoundCommit.id)
+    )
+    if inserted.scalar() is None:
         raise HTTPException(409, "Already committed this round")
-
-    db.add(RoundCommit(
-        round_id=current_round.id, agent_address=agent.wallet_address,
-        commit_hash=req.commit_hash,
-    ))
     return {"status": "committed", "round": tournament.current_round}
 
 
@@ -369,22 +639,21 @@ async def submit_reveal(
     if not tournament:
         raise HTTPException(404, "Tournament not found")
     if tournament.state != TournamentState.REVEAL:
-        raise HTTPException(400, f"Not in reveal phase (current: {TournamentState(tournament.state).name})")
-    if tournament.phase_deadline and datetime.utcnow() > tournament.phase_deadline:
+        raise HTTPException(400, f"Not in reveal phase (current: {_STATE_NAME[tournament.state]})")
+    now = datetime.utcnow()
+    if tournament.phase_deadline and now > tournament.phase_deadline:
         raise HTTPException(400, "Reveal phase ended")
 
-    round_result = await db.execute(select(Round).where(and_(
-        Round.tournament_id == tournament_id,
-        Round.round_number == tournament.current_round,
-    )))
+    round_result = await db.execute(
+        _SEL_ROUND_BY_T_NUM, {"tid": tournament_id, "num": tournament.current_round}
+    )
     current_round = round_result.scalar_one_or_none()
     if not current_round:
         raise HTTPException(500, "Round not found")
 
-    commit_result = await db.execute(select(RoundCommit).where(and_(
-        RoundCommit.round_id == current_round.id,
-        RoundCommit.agent_address == agent.wallet_address,
-    )))
+    commit_result = await db.execute(
+        _SEL_COMMIT_BY_R_ADDR, {"rid": current_round.id, "addr": agent.wallet_address}
+    )
     commit = commit_result.scalar_one_or_none()
     if not commit:
         raise HTTPException(404, "No commit found for this round")
@@ -396,14 +665,14 @@ async def submit_reveal(
     commit.bid = req.bid
     commit.salt = req.salt
     commit.revealed = True
-    commit.revealed_at = datetime.utcnow()
+    commit.revealed_at = now
     return {"status": "revealed", "round": tournament.current_round, "bid": req.bid}
 
 
 @app.get("/api/v1/tournaments/{tournament_id}/status")
 async def get_tournament_status(
-    tournament_id: int, wallet: str = None,
-    db: AsyncSession = Depends(get_db),
+    request: Request, tournament_id: int, wallet: str = None,
+    db: AsyncSession = Depends(get_db_ro),
 ):
     tournament = await db.get(Tournament, tournament_id)
     if not tournament:
@@ -421,63 +690,80 @@ async def get_tournament_status(
         if entry:
             player_info = {"is_registered": True, "is_alive": entry.is_alive, "final_rank": entry.final_rank, "has_committed": False, "has_revealed": False}
             if tournament.current_round > 0:
-                round_result = await db.execute(select(Round).where(and_(
-                    Round.tournament_id == tournament_id,
-                    Round.round_number == tournament.current_round,
-                )))
-                current_round = round_result.scalar_one_or_none()
-                if current_round:
-                    commit_result = await db.execute(select(RoundCommit).where(and_(
-                        RoundCommit.round_id == current_round.id,
+                # Current round + this wallet's commit (if any) in one query
+                commit_result = await db.execute(
+                    select(RoundCommit.id, RoundCommit.revealed)
+                    .select_from(Round)
+                    .outerjoin(RoundCommit, and_(
+                        RoundCommit.round_id == Round.id,
                         RoundCommit.agent_address == wallet,
-                    )))
-                    commit = commit_result.scalar_one_or_none()
-                    player_info["has_committed"] = commit is not None
-                    player_info["has_revealed"] = commit.revealed if commit else False
+                    ))
+                    .where(and_(
+                        Round.tournament_id == tournament_id,
+                        Round.round_number == tournament.current_round,
+                    ))
+                )
+                commit = commit_result.first()
+                if commit and commit.id is not None:
+                    player_info["has_committed"] = True
+                    player_info["has_revealed"] = commit.revealed
             result["player"] = player_info
         else:
             result["player"] = {"is_registered": False, "is_alive": False, "final_rank": None, "has_committed": False, "has_revealed": False}
 
-    return result
+    return etag_response(request, result)
 
 
 @app.get("/api/v1/tournaments/{tournament_id}/results")
-async def get_tournament_results(tournament_id: int, db: AsyncSession = Depends(get_db)):
+async def get_tournament_results(tournament_id: int, db: AsyncSession = Depends(get_db_ro)):
     tournament = await db.get(Tournament, tournament_id)
     if not tournament:
         raise HTTPException(404, "Tournament not found")
 
-    rounds_result = await db.execute(
-        select(Round).where(Round.tournament_id == tournament_id).order_by(Round.round_number)
-    )
-    rounds = rounds_result.scalars().all()
+    # Only the published columns, already sorted; hidden values come back as NULL
     show_bids = tournament.state == TournamentState.FINISHED
 
+    def hidden(col):
+        return col if show_bids else null()
+
+    rows_result = await db.execute(
+        select(
+            Round.round_number, hidden(Round.secret_number).label("secret_number"),
+            Round.players_start, Round.players_end,
+            RoundCommit.agent_address, hidden(RoundCommit.bid).label("bid"),
+            hidden(RoundCommit.distance).label("distance"),
+            RoundCommit.eliminated, RoundCommit.revealed,
+        )
+        .outerjoin(RoundCommit, RoundCommit.round_id == Round.id)
+        .where(Round.tournament_id == tournament_id)
+        .order_by(Round.round_number, RoundCommit.agent_address)
+    )
+
     round_data = []
-    for r in rounds:
-        commits_result = await db.execute(select(RoundCommit).where(RoundCommit.round_id == r.id))
-        commits = commits_result.scalars().all()
+    for _, group in groupby(rows_result.all(), key=lambda row: row.round_number):
+        rows = list(group)
+        r = rows[0]
         round_data.append({
-            "round_number": r.round_number,
-            "secret_number": r.secret_number if show_bids else None,
+            "round_number": r.round_number, "secret_number": r.secret_number,
             "players_start": r.players_start, "players_end": r.players_end,
-            "bids": [{"agent": c.agent_address, "bid": c.bid if show_bids else None,
-                       "distance": c.distance if show_bids else None,
-                       "eliminated": c.eliminated, "revealed": c.revealed} for c in commits],
+            "bids": [{"agent": c.agent_address, "bid": c.bid, "distance": c.distance,
+                      "eliminated": c.eliminated, "revealed": c.revealed}
+                     for c in rows if c.agent_address is not None],
         })
 
     entries_result = await db.execute(
-        select(TournamentEntry).where(TournamentEntry.tournament_id == tournament_id)
+        select(TournamentEntry.final_rank, TournamentEntry.agent_address, TournamentEntry.is_alive)
+        .where(TournamentEntry.tournament_id == tournament_id)
         .order_by(TournamentEntry.final_rank.asc().nullslast())
     )
-    entries = entries_result.scalars().all()
+    entries = entries_result.all()
 
     return {
         "tournament_id": tournament_id, "arena": tournament.arena,
-        "arena_name": ArenaType(tournament.arena).name,
-        "state": TournamentState(tournament.state).name,
+        "arena_name": _ARENA_NAME[tournament.arena],
+        "state": _STATE_NAME[tournament.state],
         "winner": tournament.winner_address,
-        "finalists": json.loads(tournament.finalist_addresses) if tournament.finalist_addresses else [],
+        "finalists": tournament.finalist_addresses or [],
         "prize_pool": str(tournament.prize_pool), "rounds": round_data,
         "rankings": [{"rank": e.final_rank, "agent": e.agent_address, "alive": e.is_alive} for e in entries],
         "resolve_tx": tournament.resolve_tx,
@@ -488,34 +774,86 @@ async def get_tournament_results(tournament_id: int, db: AsyncSession = Depends(
 #             HISTORY, LEADERBOARD & STATS
 # ═══════════════════════════════════════════════════════
 
+def _encode_cursor(t: Tournament) -> str:
+    raw = orjson.dumps([t.finished_at, t.id])
+    return base64.urlsafe_b64encode(raw).decode()
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        finished_at, tournament_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(finished_at), int(tournament_id)
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+
+
 @app.get("/api/v1/tournaments/history")
-async def get_tournament_history(arena: int = None, limit: int = 20, offset: int = 0, db: AsyncSession = Depends(get_db)):
-    query = select(Tournament).where(Tournament.state == TournamentState.FINISHED).order_by(Tournament.finished_at.desc())
+async def get_tournament_history(
+    request: Request, arena: int = None, limit: int = 20, offset: int = 0,
+    cursor: str = None, since: str = None, db: AsyncSession = Depends(get_db_ro),
+):
+    """
+    Finished tournaments, newest first. Pass the returned next_cursor to get
+    the following page (keyset on finished_at, id — cost doesn't grow with
+    depth). offset still works for old clients when no cursor is given.
+
+    since=<a tournament's cursor> flips it into a feed: only tournaments
+    that finished after that one, oldest first. Pollers keep the cursor of
+    the last one they handled and only ever see what's new.
+    """
+    query = tournaments_query().where(Tournament.state == TournamentState.FINISHED)
     if arena is not None:
         query = query.where(Tournament.arena == arena)
-    query = query.offset(offset).limit(limit)
-    result = await db.execute(query)
-    return {"tournaments": [_format_tournament(t) for t in result.scalars().all()]}
+    if since:
+        finished_at, tournament_id = _decode_cursor(since)
+        query = query.where(or_(
+            Tournament.finished_at > finished_at,
+            and_(Tournament.finished_at == finished_at, Tournament.id > tournament_id),
+        )).order_by(Tournament.finished_at, Tournament.id)
+    else:
+        if cursor:
+            finished_at, tournament_id = _decode_cursor(cursor)
+            query = query.where(or_(
+                Tournament.finished_at < finished_at,
+                and_(Tournament.finished_at == finished_at, Tournament.id < tournament_id),
+            ))
+        elif offset:
+            query = query.offset(offset)
+        query = query.order_by(Tournament.finished_at.desc(), Tournament.id.desc())
+    tournaments = (await db.execute(query.limit(limit))).scalars().all()
+    next_cursor = _encode_cursor(tournaments[-1]) if len(tournaments) == limit and not since else None
+    return etag_response(request, {
+        "tournaments": [{**_format_tournament(t), "cursor": _encode_cursor(t)} for t in tournaments],
+        "next_cursor": next_cursor,
+    })
 
 
 @app.get("/api/v1/leaderboard")
-async def get_leaderboard(limit: int = 50, db: AsyncSession = Depends(get_db)):
+async def get_leaderboard(
+    request: Request, limit: int = Query(50, ge=1, le=100), db: AsyncSession = Depends(get_db_ro),
+):
+    cache_key = f"leaderboard:v1:{limit}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
     result = await db.execute(
         select(Agent).where(Agent.tournaments_played > 0)
         .order_by(desc(Agent.tournaments_won), desc(Agent.tournaments_played))
         .limit(limit)
     )
-    return {"leaderboard": [
+    response = {"leaderboard": [
         {"rank": i+1, "name": a.name, "wallet": a.wallet_address,
          "wins": a.tournaments_won, "played": a.tournaments_played,
          "win_rate": round(a.tournaments_won / a.tournaments_played * 100, 1) if a.tournaments_played > 0 else 0,
          "total_earnings": str(a.total_earnings)}
         for i, a in enumerate(result.scalars().all())
     ]}
+    await response_cache.set(cache_key, response, LEADERBOARD_TTL)
+    return etag_response(request, response)
 
 
 @app.get("/api/v1/agents/{agent_id}/stats")
-async def get_agent_stats(agent_id: int, db: AsyncSession = Depends(get_db)):
+async def get_agent_stats(agent_id: int, db: AsyncSession = Depends(get_db_ro)):
     agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(404, "Agent not found")
@@ -524,144 +862,231 @@ async def get_agent_stats(agent_id: int, db: AsyncSession = Depends(get_db)):
         "status": agent.status, "tournaments_played": agent.tournaments_played,
         "tournaments_won": agent.tournaments_won,
         "win_rate": round(agent.tournaments_won / agent.tournaments_played * 100, 2) if agent.tournaments_played > 0 else 0,
-        "total_earnings": str(agent.total_earnings), "created_at": agent.created_at.isoformat(),
+        "total_earnings": str(agent.total_earnings), "created_at": agent.created_at,
     }
 
 
 @app.get("/api/v1/stats")
-async def get_platform_stats(db: AsyncSession = Depends(get_db)):
-    total = await db.execute(select(func.count(Tournament.id)))
-    finished = await db.execute(select(func.count(Tournament.id)).where(Tournament.state == TournamentState.FINISHED))
-    agents = await db.execute(select(func.count(Agent.id)))
+async def get_platform_stats(db: AsyncSession = Depends(get_db_ro)):
+    cached = await response_cache.get("stats:v1")
+    if cached is not None:
+        return cached
+
+    counts = (await db.execute(select(
+        select(func.count(Tournament.id)).scalar_subquery().label("total"),
+        select(func.count(Tournament.id)).where(Tournament.state == TournamentState.FINISHED)
+        .scalar_subquery().label("finished"),
+        select(func.count(Agent.id)).scalar_subquery().label("agents"),
+    ))).one()
     chain_stats = {}
     try:
         bc = get_blockchain()
         if bc.contract:
-            chain_stats = bc.get_stats()
+            chain_stats = await bc.get_stats()
     except Exception:
         pass
-    return {
-        "total_tournaments": total.scalar(), "completed_tournaments": finished.scalar(),
-        "registered_agents": agents.scalar(),
+    response = {
+        "total_tournaments": counts.total, "completed_tournaments": counts.finished,
+        "registered_agents": counts.agents,
         "total_burned": str(chain_stats.get("total_burned", 0)),
         "total_distributed": str(chain_stats.get("total_distributed", 0)),
     }
+    await response_cache.set("stats:v1", response, STATS_TTL)
+    return response
+
+
+# Pure config — built once at import
+CONTRACT_INFO = {
+    "contract_address": config.CONTRACT_ADDRESS,
+    "game_token_address": config.GAME_TOKEN_ADDRESS,
+    "treasury_address": config.TREASURY_ADDRESS,
+    "chain_id": config.CHAIN_ID, "rpc_url": config.RPC_URL,
+    "arenas": {
+        "bronze": {"id": 0, "fee_eth": config.ARENA_FEES_ETH[0], "fee_usd": config.ARENA_FEES_USD[0]},
+        "silver": {"id": 1, "fee_eth": config.ARENA_FEES_ETH[1], "fee_usd": config.ARENA_FEES_USD[1]},
+        "gold": {"id": 2, "fee_eth": config.ARENA_FEES_ETH[2], "fee_usd": config.ARENA_FEES_USD[2]},
+    },
+}
 
 
 @app.get("/api/v1/contract")
-async def get_contract_info():
-    return {
-        "contract_address": config.CONTRACT_ADDRESS,
-        "game_token_address": config.GAME_TOKEN_ADDRESS,
-        "treasury_address": config.TREASURY_ADDRESS,
-        "chain_id": config.CHAIN_ID, "rpc_url": config.RPC_URL,
-        "arenas": {
-            "bronze": {"id": 0, "fee_eth": config.ARENA_FEES_ETH[0], "fee_usd": config.ARENA_FEES_USD[0]},
-            "silver": {"id": 1, "fee_eth": config.ARENA_FEES_ETH[1], "fee_usd": config.ARENA_FEES_USD[1]},
-            "gold": {"id": 2, "fee_eth": config.ARENA_FEES_ETH[2], "fee_usd": config.ARENA_FEES_USD[2]},
-        },
-    }
+async def get_contract_info(request: Request):
+    return etag_response(request, CONTRACT_INFO)
 
 
 @app.put("/api/v1/agents/status")
-async def update_agent_status(status: str, agent: Agent = Depends(get_agent), db: AsyncSession = Depends(get_db)):
+async def update_agent_status(
+    status: str, background_tasks: BackgroundTasks,
+    agent: Agent = Depends(get_agent), db: AsyncSession = Depends(get_db),
+):
     if status not in ("active", "paused", "withdrawn"):
         raise HTTPException(400, "Status must be: active, paused, withdrawn")
     agent.status = status
-    return {"status": agent.status, "message": f"Agent is now {status}"}
+    # Evict now and again once committed: a request landing in between could
+    # otherwise re-cache the old status for the full TTL
+    _AGENT_CACHE.pop(agent.api_key, None)
+    background_tasks.add_task(_AGENT_CACHE.pop, agent.api_key, None)
+    return {"status": status, "message": f"Agent is now {status}"}
 
 
 # ═══════════════════════════════════════════════════════
 #           BACKGROUND: TOURNAMENT MANAGER
 # ═══════════════════════════════════════════════════════
 
+_wake = asyncio.Event()  # set to run the manager now instead of at the next deadline
+
+
 async def tournament_manager():
+    """
+    Run the three phases concurrently, each on its own session, then sleep
+    until the nearest phase deadline (or until woken by an endpoint).
+    On-chain calls happen outside DB transactions so a slow RPC never holds
+    a connection (or SQLite's write lock).
+    """
     logger.info("Tournament manager started")
     while True:
+        delay = config.MANAGER_IDLE_INTERVAL
         try:
-            async with SessionLocal() as db:
-                await ensure_open_tournaments(db)
-                await process_phase_transitions(db)
-                await cancel_expired_tournaments(db)
-                await db.commit()
+            results = await asyncio.gather(
+                ensure_open_tournaments(),
+                process_phase_transitions(),
+                cancel_expired_tournaments(),
+                return_exceptions=True,
+            )
+            for r in results:
+                if isinstance(r, Exception):
+                    logger.error(f"Tournament manager error: {r}", exc_info=r)
+            if isinstance(results[1], int) and results[1]:
+                await response_cache.delete_prefix("leaderboard:", "stats:")
+            delay = await seconds_until_next_deadline()
         except asyncio.CancelledError:
             break
         except Exception as e:
             logger.error(f"Tournament manager error: {e}", exc_info=True)
-        await asyncio.sleep(10)
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+
+
+async def seconds_until_next_deadline() -> float:
+    async with ReadSessionLocal() as db:
+        result = await db.execute(
+            select(func.min(Tournament.phase_deadline)).where(
+                Tournament.state.in_([TournamentState.COMMIT, TournamentState.REVEAL])
+            )
+        )
+        deadline = result.scalar()
+    if deadline is None:
+        return config.MANAGER_IDLE_INTERVAL
+    remaining = (deadline - datetime.utcnow()).total_seconds()
+    # Floor of 1s so a transition that keeps failing can't spin the loop
+    return min(max(remaining, 1), config.MANAGER_IDLE_INTERVAL)
+
+
+async def ensure_open_tournaments():
+    async with ReadSessionLocal() as db:
+        result = await db.execute(
+            select(Tournament.arena).where(Tournament.state == TournamentState.OPEN)
+        )
+        open_arenas = set(result.scalars().all())
 
+    created = []
+    for arena in ArenaType:
+        if arena in open_arenas:
+            continue
+        try:
+            bc = get_blockchain()
+            entry_fee = bc.calculate_entry_fee_game(arena)
+            tx_hash, chain_id = await bc.create_tournament(arena, entry_fee)
+            created.append(Tournament(chain_id=chain_id, arena=arena, entry_fee_game=entry_fee, variant=GameVariant.CLASSIC))
+            logger.info(f"Created {arena.name} tournament (chain_id={chain_id})")
+        except Exception as e:
+            logger.error(f"Failed to create arena={arena.value}: {e}")
 
-async def ensure_open_tournaments(db: AsyncSession):
-    for arena in [0, 1, 2]:
-        result = await db.execute(select(Tournament).where(and_(
-            Tournament.arena == arena, Tournament.state == TournamentState.OPEN,
-        )))
-        if not result.scalar_one_or_none():
+    if created:
+        async with SessionLocal() as db, write_transaction(db):
+            db.add_all(created)
+
+
+async def process_phase_transitions() -> int:
+    """Advance every tournament past its deadline. Returns how many finished."""
+    now = datetime.utcnow()
+    finished = 0
+    to_resolve = []  # (tournament_id, chain_id, ranking) — sent on-chain after commit
+    async with SessionLocal() as db, write_transaction(db):
+        # Each due tournament with its current round, in one query
+        result = await db.execute(
+            select(Tournament, Round)
+            .join(Round, and_(
+                Round.tournament_id == Tournament.id,
+                Round.round_number == Tournament.current_round,
+            ))
+            .where(and_(
+                Tournament.state.in_([TournamentState.COMMIT, TournamentState.REVEAL]),
+                Tournament.phase_deadline < now,
+            ))
+        )
+        for tournament, current_round in result.all():
             try:
-                bc = get_blockchain()
-                entry_fee = bc.calculate_entry_fee_game(arena)
-                tx_hash, chain_id = bc.create_tournament(arena, entry_fee)
-                db.add(Tournament(chain_id=chain_id, arena=arena, entry_fee_game=str(entry_fee), variant=GameVariant.CLASSIC))
-                logger.info(f"Created {ArenaType(arena).name} tournament (chain_id={chain_id})")
+                if tournament.state == TournamentState.COMMIT:
+                    await GameEngine.open_reveal_phase(db, current_round)
+                    logger.info(f"T{tournament.id} R{tournament.current_round}: commit -> reveal")
+
+                elif tournament.state == TournamentState.REVEAL:
+                    result = await GameEngine.resolve_round(db, current_round)
+                    logger.info(f"T{tournament.id} R{tournament.current_round}: resolved ({result['type']})")
+
+                    if result["type"] == "final":
+                        ranking = result["ranking"]
+                        await GameEngine.finish_tournament(db, tournament.id, ranking)
+                        finished += 1
+                        to_resolve.append((tournament.id, tournament.chain_id, ranking))
+                    elif result["type"] == "no_reveals":
+                        await GameEngine.finish_tournament(db, tournament.id, [])
+                        finished += 1
+                    else:
+                        alive_count = len(result["survivors"])
+                        await GameEngine.start_new_round(db, tournament.id, alive_count)
+
             except Exception as e:
-                logger.error(f"Failed to create arena={arena}: {e}")
+                logger.error(f"Phase error T{tournament.id}: {e}", exc_info=True)
 
+    if to_resolve:
+        await asyncio.gather(*(resolve_on_chain(*args) for args in to_resolve))
+    return finished
 
-async def process_phase_transitions(db: AsyncSession):
-    now = datetime.utcnow()
-    result = await db.execute(select(Tournament).where(and_(
-        Tournament.state.in_([TournamentState.COMMIT, TournamentState.REVEAL]),
-        Tournament.phase_deadline < now,
-    )))
-    for tournament in result.scalars().all():
-        try:
-            round_result = await db.execute(select(Round).where(and_(
-                Round.tournament_id == tournament.id,
-                Round.round_number == tournament.current_round,
-            )))
-            current_round = round_result.scalar_one_or_none()
-            if not current_round:
-                continue
-
-            if tournament.state == TournamentState.COMMIT:
-                await GameEngine.open_reveal_phase(db, current_round)
-                logger.info(f"T{tournament.id} R{tournament.current_round}: commit -> reveal")
-
-            elif tournament.state == TournamentState.REVEAL:
-                result = await GameEngine.resolve_round(db, current_round)
-                logger.info(f"T{tournament.id} R{tournament.current_round}: resolved ({result['type']})")
-
-                if result["type"] == "final":
-                    ranking = result["ranking"]
-                    await GameEngine.finish_tournament(db, tournament.id, ranking)
-                    try:
-                        bc = get_blockchain()
-                        tx_hash = bc.resolve_tournament(tournament.chain_id, ranking[0], ranking[1:5])
-                        tournament.resolve_tx = tx_hash
-                    except Exception as e:
-                        logger.error(f"On-chain resolve failed T{tournament.id}: {e}")
-                elif result["type"] == "no_reveals":
-                    await GameEngine.finish_tournament(db, tournament.id, [])
-                else:
-                    alive_count = len(result["survivors"])
-                    await GameEngine.start_new_round(db, tournament.id, alive_count)
 
-        except Exception as e:
-            logger.error(f"Phase error T{tournament.id}: {e}", exc_info=True)
+async def resolve_on_chain(tournament_id: int, chain_id: int, ranking: list[str]):
+    try:
+        bc = get_blockchain()
+        tx_hash = await bc.resolve_tournament(chain_id, ranking[0], ranking[1:5])
+    except Exception as e:
+        logger.error(f"On-chain resolve failed T{tournament_id}: {e}")
+        return
+    async with SessionLocal() as db, write_transaction(db):
+        await db.execute(
+            update(Tournament).where(Tournament.id == tournament_id).values(resolve_tx=tx_hash)
+        )
 
 
-async def cancel_expired_tournaments(db: AsyncSession):
+async def cancel_expired_tournaments():
     cutoff = datetime.utcnow() - timedelta(seconds=config.CANCEL_DEADLINE)
-    result = await db.execute(select(Tournament).where(and_(
-        Tournament.state == TournamentState.OPEN, Tournament.created_at < cutoff,
-    )))
-    for t in result.scalars().all():
-        t.state = TournamentState.CANCELLED
-        logger.info(f"Cancelled expired tournament {t.id}")
+    async with SessionLocal() as db, write_transaction(db):
+        result = await db.execute(select(Tournament).where(and_(
+            Tournament.state == TournamentState.OPEN, Tournament.created_at < cutoff,
+        )))
+        expired = result.scalars().all()
+        for t in expired:
+            t.state = TournamentState.CANCELLED
+            logger.info(f"Cancelled expired tournament {t.id}")
+
+    for t in expired:
         try:
             bc = get_blockchain()
             if t.chain_id is not None:
-                bc.cancel_tournament(t.chain_id)
+                await bc.cancel_tournament(t.chain_id)
         except Exception as e:
             logger.error(f"On-chain cancel failed T{t.id}: {e}")
 
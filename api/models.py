@@ -1,16 +1,129 @@
 """
 Claw Game — Database Models
 """
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Float, Boolean, DateTime,
-    ForeignKey, Text, BigInteger, Enum as SAEnum
+    event, inspect, select, Column, Integer, String, Float, Boolean, DateTime,
+    ForeignKey, BigInteger, Index, JSON, Numeric, Enum as SAEnum, text
 )
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import relationship, declarative_base, selectinload
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.types import TypeDecorator
 import enum
 
 Base = declarative_base()
 
+# Per-connection SQLite tuning: WAL lets readers run alongside the writer and
+# synchronous=NORMAL only fsyncs at checkpoints. foreign_keys stays off —
+# join-time commits park on round_id=0, which has no rounds row.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def make_engine(url: str | URL, **kwargs) -> AsyncEngine:
+    """create_async_engine, plus the PRAGMAs above on every SQLite connection."""
+    engine = create_async_engine(url, **kwargs)
+    if engine.dialect.name == "sqlite":
+        # journal_mode is a write; read-only connections just inherit WAL
+        read_only = engine.url.query.get("mode") == "ro"
+        pragmas = [p for p in SQLITE_PRAGMAS if not (read_only and "journal_mode" in p)]
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _sqlite_pragmas(dbapi_conn, _record):
+            cursor = dbapi_conn.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+    return engine
+
+
+def make_engines(url: str, read_pool_size: int = 5, **kwargs) -> tuple[AsyncEngine, AsyncEngine]:
+    """
+    (writer, reader). For a SQLite file the writer is a single connection —
+    SQLite only ever has one writer — and reads get their own read-only
+    pool of read_pool_size connections, which WAL runs alongside it.
+    Anything else: one engine for both, sized by kwargs.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        engine = make_engine(url, **kwargs)
+        return engine, engine
+    # aiosqlite file databases default to NullPool — a fresh connection (and
+    # thread, and PRAGMA run) per checkout — so both pools are explicit
+    writer = make_engine(url, **{
+        **kwargs, "poolclass": AsyncAdaptedQueuePool, "pool_size": 1, "max_overflow": 0,
+    })
+    reader = make_engine(
+        parsed.set(
+            database=f"file:{parsed.database}",
+            query={**parsed.query, "mode": "ro", "uri": "true"},
+        ),
+        **{**kwargs, "poolclass": AsyncAdaptedQueuePool, "pool_size": read_pool_size},
+    )
+    return writer, reader
+
+
+# SQLite allows one writer per file; queue writers here instead of letting
+# pooled connections pile up on SQLite's lock
+write_lock = asyncio.Lock()
+
+
+@asynccontextmanager
+async def write_transaction(db: AsyncSession):
+    """
+    Run a write transaction on a fresh session via db.begin(): commit on
+    success, roll back on error — the connection is released either way.
+    On SQLite, writers in this process take turns on write_lock and
+    BEGIN IMMEDIATE grabs the file's write lock up front, so the transaction
+    never has to upgrade from reader to writer mid-way (SQLITE_BUSY).
+    """
+    if db.bind.dialect.name != "sqlite":
+        async with db.begin():
+            yield db
+        return
+    async with write_lock, db.begin():
+        await db.execute(text("BEGIN IMMEDIATE"))
+        yield db
+
+
+# uint256 tops out at 78 decimal digits
+WEI_DIGITS = 78
+
+
+class WeiAmount(TypeDecorator):
+    """
+    A uint256 token amount, as a Python int. Postgres: NUMERIC(78, 0).
+    SQLite has no exact type that wide (NUMERIC affinity drops to REAL past
+    2**63), so it gets TEXT zero-padded to 78 digits — comparisons and
+    ORDER BY on the raw column are then numeric-correct.
+    """
+    impl = String(WEI_DIGITS)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String(WEI_DIGITS))
+        return dialect.type_descriptor(Numeric(WEI_DIGITS, 0))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        value = int(value)
+        return str(value).zfill(WEI_DIGITS) if dialect.name == "sqlite" else value
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else int(value)
+
 
 class ArenaType(enum.IntEnum):
     BRONZE = 0
@@ -52,7 +165,7 @@ class Agent(Base):
     # Stats
     tournaments_played = Column(Integer, default=0)
     tournaments_won = Column(Integer, default=0)
-    total_earnings = Column(String, default="0")  # in $GAME wei
+    total_earnings = Column(WeiAmount, default=0)  # in $GAME wei
 
     entries = relationship("TournamentEntry", back_populates="agent")
 
@@ -63,21 +176,26 @@ class Agent(Base):
 
 class Tournament(Base):
     __tablename__ = "tournaments"
+    __table_args__ = (
+        # "open tournaments per arena" — also serves plain state filters and
+        # the live-tournament (state < 5) range scans
+        Index("ix_t_state_arena", "state", "arena"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    chain_id = Column(Integer, nullable=True)  # On-chain tournament ID
+    chain_id = Column(Integer, nullable=True, index=True)  # On-chain tournament ID
     arena = Column(Integer, nullable=False)     # 0=Bronze, 1=Silver, 2=Gold
     state = Column(Integer, default=TournamentState.OPEN)
     variant = Column(Integer, default=GameVariant.CLASSIC)
-    entry_fee_game = Column(String, nullable=False)  # $GAME amount (wei)
+    entry_fee_game = Column(WeiAmount, nullable=False)  # $GAME amount (wei)
 
     player_count = Column(Integer, default=0)
     current_round = Column(Integer, default=0)
-    prize_pool = Column(String, default="0")
+    prize_pool = Column(WeiAmount, default=0)
 
     # Results
     winner_address = Column(String(42), nullable=True)
-    finalist_addresses = Column(Text, nullable=True)  # JSON array
+    finalist_addresses = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)  # list[str]
 
     # Timing
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -98,6 +216,11 @@ class Tournament(Base):
 
 class TournamentEntry(Base):
     __tablename__ = "tournament_entries"
+    __table_args__ = (
+        Index("ix_entry_t_addr", "tournament_id", "agent_address", unique=True),
+        # "who's still alive" each round
+        Index("ix_entry_t_alive", "tournament_id", "is_alive"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=False)
@@ -107,7 +230,7 @@ class TournamentEntry(Base):
 
     is_alive = Column(Boolean, default=True)  # Still in tournament
     final_rank = Column(Integer, nullable=True)
-    prize_amount = Column(String, default="0")
+    prize_amount = Column(WeiAmount, default=0)
 
     joined_at = Column(DateTime, default=datetime.utcnow)
 
@@ -121,6 +244,9 @@ class TournamentEntry(Base):
 
 class Round(Base):
     __tablename__ = "rounds"
+    __table_args__ = (
+        Index("ix_round_t_num", "tournament_id", "round_number", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=False)
@@ -143,9 +269,21 @@ class Round(Base):
 
 class RoundCommit(Base):
     __tablename__ = "round_commits"
+    __table_args__ = (
+        # round_id=0 holds join-time commits; one agent may have several
+        # pending (one per open tournament), told apart by tournament_id
+        Index(
+            "ix_commit_r_addr", "round_id", "agent_address", unique=True,
+            postgresql_where=text("round_id > 0"), sqlite_where=text("round_id > 0"),
+        ),
+        # Full (not partial), so it also covers round 0 and plain round_id lookups
+        Index("ix_commit_r_revealed", "round_id", "revealed"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     round_id = Column(Integer, ForeignKey("rounds.id"), nullable=False)
+    # Set on join-time commits so the tournament's start promotes only its own
+    tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=True)
     agent_address = Column(String(42), nullable=False)
 
     commit_hash = Column(String(66), nullable=False)  # keccak256(bid + salt)
@@ -159,3 +297,110 @@ class RoundCommit(Base):
     revealed_at = Column(DateTime, nullable=True)
 
     round = relationship("Round", back_populates="commits")
+
+
+def tournaments_query(*loads: str):
+    """
+    select(Tournament) with the named relationships eager-loaded via selectin
+    (one extra IN query per relationship, not one per tournament).
+    loads: "entries", "rounds" (rounds come with their commits).
+    """
+    options = {
+        "entries": selectinload(Tournament.entries),
+        "rounds": selectinload(Tournament.rounds).selectinload(Round.commits),
+    }
+    return select(Tournament).options(*(options[name] for name in loads))
+
+
+# Single-column indexes now covered by a composite index's leading column
+SUPERSEDED_INDEXES = (
+    "ix_tournaments_state",      # -> ix_t_state_arena
+    "ix_t_open",                 # partial state index -> ix_t_state_arena
+    "ix_round_commits_round_id", # -> ix_commit_r_revealed
+)
+
+
+def create_missing_indexes(conn):
+    """
+    create_all() skips indexes on tables that already exist — add them, and
+    drop the superseded ones so writes stop maintaining them.
+    """
+    for name in SUPERSEDED_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _pg_column_type(conn, table: str, column: str) -> str | None:
+    return conn.execute(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_name = :t AND column_name = :c"
+    ), {"t": table, "c": column}).scalar()
+
+
+def migrate_join_commits(conn):
+    """
+    Add round_commits.tournament_id to databases created without it, and
+    backfill pending join-time commits whose agent has exactly one OPEN
+    entry — any other case can't be attributed and stays NULL.
+    No-op once done.
+    """
+    columns = {c["name"] for c in inspect(conn).get_columns("round_commits")}
+    if "tournament_id" in columns:
+        return
+    conn.execute(text("ALTER TABLE round_commits ADD COLUMN tournament_id INTEGER"))
+    open_entries = (
+        "FROM tournament_entries e JOIN tournaments t ON t.id = e.tournament_id "
+        "WHERE t.state = 0 AND e.agent_address = round_commits.agent_address"
+    )
+    conn.execute(text(
+        f"UPDATE round_commits SET tournament_id = (SELECT e.tournament_id {open_entries}) "
+        f"WHERE round_id = 0 AND (SELECT count(*) {open_entries}) = 1"
+    ))
+
+
+def migrate_json_columns(conn):
+    """
+    One-shot upgrade of finalist_addresses from TEXT (a serialized array) to
+    JSONB on Postgres. SQLite's JSON type is stored as TEXT already, so the
+    old rows read back as-is there. No-op once done.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    if _pg_column_type(conn, "tournaments", "finalist_addresses") == "text":
+        conn.execute(text(
+            "ALTER TABLE tournaments ALTER COLUMN finalist_addresses "
+            "TYPE JSONB USING finalist_addresses::jsonb"
+        ))
+
+
+WEI_COLUMNS = (
+    ("agents", "total_earnings"),
+    ("tournaments", "entry_fee_game"),
+    ("tournaments", "prize_pool"),
+    ("tournament_entries", "prize_amount"),
+)
+
+
+def migrate_wei_columns(conn):
+    """
+    One-shot upgrade of databases created when wei amounts were plain
+    strings. Postgres: retype to NUMERIC. SQLite: left-pad to WEI_DIGITS.
+    No-op once done.
+    """
+    if conn.dialect.name == "postgresql":
+        for table, column in WEI_COLUMNS:
+            data_type = _pg_column_type(conn, table, column)
+            if data_type and data_type != "numeric":
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} "
+                    f"TYPE NUMERIC({WEI_DIGITS}, 0) USING CAST({column} AS NUMERIC)"
+                ))
+    elif conn.dialect.name == "sqlite":
+        zeros = "0" * WEI_DIGITS
+        for table, column in WEI_COLUMNS:
+            conn.execute(text(
+                f"UPDATE {table} SET {column} = substr('{zeros}' || {column}, -{WEI_DIGITS}) "
+                f"WHERE length({column}) < {WEI_DIGITS}"
+            ))
@@ -3,31 +3,29 @@ import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
 
 import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 # Import models
-from models import Base, Tournament, TournamentState, GameVariant
+from models import Base, Tournament, TournamentState, GameVariant, make_engine, write_transaction
 
 DB_URL = "sqlite+aiosqlite:///./clawgame.db"
 
 async def main():
-    engine = create_async_engine(DB_URL)
+    engine = make_engine(DB_URL)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
     Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    async with Session() as db:
+    async with Session() as db, write_transaction(db):
         # Tournament 0 = Bronze, 1 = Silver, 2 = Gold (already on-chain)
         tournaments = [
-            Tournament(chain_id=0, arena=0, entry_fee_game="1000000000000000000000", state=TournamentState.OPEN, variant=GameVariant.CLASSIC),
-            Tournament(chain_id=1, arena=1, entry_fee_game="10000000000000000000000", state=TournamentState.OPEN, variant=GameVariant.CLASSIC),
-            Tournament(chain_id=2, arena=2, entry_fee_game="100000000000000000000000", state=TournamentState.OPEN, variant=GameVariant.CLASSIC),
+            Tournament(chain_id=0, arena=0, entry_fee_game=1_000 * 10**18, state=TournamentState.OPEN, variant=GameVariant.CLASSIC),
+            Tournament(chain_id=1, arena=1, entry_fee_game=10_000 * 10**18, state=TournamentState.OPEN, variant=GameVariant.CLASSIC),
+            Tournament(chain_id=2, arena=2, entry_fee_game=100_000 * 10**18, state=TournamentState.OPEN, variant=GameVariant.CLASSIC),
         ]
-        for t in tournaments:
-            db.add(t)
-        await db.commit()
-        print("Seeded 3 tournaments (Bronze=0, Silver=1, Gold=2)")
+        db.add_all(tournaments)  # flushed as one multi-row INSERT (insertmanyvalues)
+    print("Seeded 3 tournaments (Bronze=0, Silver=1, Gold=2)")
 
     await engine.dispose()
 
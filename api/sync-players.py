@@ -2,26 +2,26 @@
 import asyncio, sys, os
 sys.path.insert(0, os.path.dirname(__file__))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select
-from models import Tournament
+import aiosqlite
+from models import SQLITE_PRAGMAS, WEI_DIGITS
 
-DB_URL = "sqlite+aiosqlite:///./clawgame.db"
+DB_PATH = "./clawgame.db"
 
 async def main():
-    engine = create_async_engine(DB_URL)
-    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    async with Session() as db:
-        result = await db.execute(select(Tournament).where(Tournament.chain_id == 0))
-        bronze = result.scalar_one_or_none()
-        if bronze:
-            bronze.player_count = 5
-            bronze.prize_pool = str(1000 * 5 * 10**18)  # 5000 GAME in wei
-            await db.commit()
-            print(f"Bronze tournament updated: player_count=5, prize_pool={bronze.prize_pool}")
-        else:
-            print("Bronze tournament not found")
-    await engine.dispose()
+    # One UPDATE doesn't need an engine or a session — one raw connection
+    async with aiosqlite.connect(DB_PATH) as db:
+        for pragma in SQLITE_PRAGMAS:
+            await db.execute(pragma)
+        prize_pool = 1000 * 5 * 10**18  # 5000 GAME in wei
+        cursor = await db.execute(
+            "UPDATE tournaments SET player_count = ?, prize_pool = ? WHERE chain_id = 0",
+            # Same zero-padded TEXT that models.WeiAmount writes on SQLite
+            (5, str(prize_pool).zfill(WEI_DIGITS)),
+        )
+        await db.commit()
+    if cursor.rowcount:
+        print(f"Bronze tournament updated: player_count=5, prize_pool={prize_pool}")
+    else:
+        print("Bronze tournament not found")
 
 asyncio.run(main())
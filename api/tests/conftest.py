@@ -0,0 +1,58 @@
+"""
+Point the API at a throwaway SQLite file before main/config are imported —
+config reads the environment once, at import.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR))
+
+DB_DIR = Path(tempfile.mkdtemp(prefix="clawgame-test-"))
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_DIR / 'clawgame.db'}"
+os.environ["REDIS_URL"] = ""        # in-process rate limiter and cache
+os.environ["CONTRACT_ADDRESS"] = ""  # no on-chain checks
+
+
+def run_db(fn):
+    """
+    Run `await fn(db)` in a write transaction on the app's database and
+    return its result. Pooled connections belong to this call's event loop,
+    and the test client runs its own, so both engines are released after.
+    """
+    import main
+    from models import write_transaction
+
+    async def go():
+        try:
+            async with main.SessionLocal() as db, write_transaction(db):
+                return await fn(db)
+        finally:
+            await main.engine.dispose()
+            await main.read_engine.dispose()
+
+    return asyncio.run(go())
+
+
+@pytest.fixture
+def client():
+    """Test client on a fresh schema. No `with`: skips the lifespan, which
+    would start the on-chain tournament manager."""
+    from fastapi.testclient import TestClient
+    import main
+    from models import Base
+
+    async def reset():
+        async with main.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        await main.engine.dispose()
+
+    asyncio.run(reset())
+    main._AGENT_CACHE.clear()
+    return TestClient(main.app)
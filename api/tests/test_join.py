@@ -0,0 +1,60 @@
+"""Joining tournaments, including an agent entered in more than one arena."""
+import dataclasses
+
+from sqlalchemy import select
+
+import main
+from conftest import run_db
+from models import GameVariant, RoundCommit, Tournament, TournamentState
+
+COMMIT_HASH = "0x" + "ab" * 32
+
+
+def _register(client, n: int) -> dict:
+    wallet = f"0x{n:040x}"
+    resp = client.post("/api/v1/agents/register", json={
+        "wallet_address": wallet, "creator_address": wallet,
+    })
+    assert resp.status_code == 200
+    return {"X-API-Key": resp.json()["api_key"]}
+
+
+def _join(client, tournament_id: int, headers: dict):
+    return client.post(
+        f"/api/v1/tournaments/{tournament_id}/join",
+        json={"commit_hash": COMMIT_HASH}, headers=headers,
+    )
+
+
+def test_filling_one_arena_leaves_other_join_commits_pending(client, monkeypatch):
+    monkeypatch.setattr(main, "config", dataclasses.replace(main.config, MAX_PLAYERS=2))
+
+    async def seed(db):
+        bronze, silver = (
+            Tournament(arena=arena, entry_fee_game=10**18,
+                       state=TournamentState.OPEN, variant=GameVariant.CLASSIC)
+            for arena in (0, 1)
+        )
+        db.add_all([bronze, silver])
+        await db.flush()
+        return bronze.id, silver.id
+
+    bronze_id, silver_id = run_db(seed)
+    a, b = _register(client, 1), _register(client, 2)
+
+    assert _join(client, silver_id, a).status_code == 200
+    assert _join(client, bronze_id, a).status_code == 200
+    resp = _join(client, bronze_id, b)  # fills bronze
+    assert resp.status_code == 200
+    assert resp.json()["started"] is True
+
+    async def commits(db):
+        rows = await db.execute(
+            select(RoundCommit.tournament_id, RoundCommit.round_id)
+            .where(RoundCommit.agent_address == f"0x{1:040x}")
+        )
+        return {tid: round_id for tid, round_id in rows}
+
+    by_tournament = run_db(commits)
+    assert by_tournament[bronze_id] > 0   # promoted onto bronze round 1
+    assert by_tournament[silver_id] == 0  # still waiting for silver to fill
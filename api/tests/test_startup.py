@@ -0,0 +1,20 @@
+"""The app must import and build its engines against the default file-SQLite setup."""
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+import main
+from conftest import DB_DIR
+
+
+def test_app_imports_against_file_sqlite():
+    assert main.engine.dialect.name == "sqlite"
+    assert main.engine.url.database == str(DB_DIR / "clawgame.db")
+    # SQLite file: dedicated single-connection writer, separate read-only reader
+    assert main.read_engine is not main.engine
+    assert main.engine.pool.size() == 1
+
+
+def test_sqlite_reader_is_a_sized_pool():
+    # Not NullPool: reads reuse connections instead of opening one per request
+    assert isinstance(main.read_engine.pool, AsyncAdaptedQueuePool)
+    assert main.read_engine.pool.size() == main.config.DB_POOL_SIZE
+    assert main.read_engine.url.query["mode"] == "ro"
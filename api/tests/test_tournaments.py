@@ -0,0 +1,22 @@
+"""Endpoint tests against the file-SQLite database set up in conftest."""
+from conftest import run_db
+from models import GameVariant, Tournament, TournamentState
+
+
+async def _seed(db):
+    db.add_all([
+        Tournament(chain_id=0, arena=0, entry_fee_game=1_000 * 10**18,
+                   state=TournamentState.OPEN, variant=GameVariant.CLASSIC),
+        Tournament(chain_id=1, arena=1, entry_fee_game=10_000 * 10**18,
+                   state=TournamentState.FINISHED, variant=GameVariant.CLASSIC),
+    ])
+
+
+def test_current_tournaments(client):
+    run_db(_seed)
+    resp = client.get("/api/v1/tournaments/current")
+    assert resp.status_code == 200
+    tournaments = resp.json()["tournaments"]
+    assert [t["chain_id"] for t in tournaments] == [0]
+    assert tournaments[0]["state_name"] == "OPEN"
+    assert tournaments[0]["entry_fee_game"] == str(1_000 * 10**18)
@@ -10,17 +10,18 @@ Fixes:
 """
 
 import os
-import json
+import asyncio
 import time
 import random
+import re
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 
-import tweepy
 import anthropic
 import httpx
-import schedule
+import orjson
+from tweepy.asynchronous import AsyncClient
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -38,6 +39,8 @@ CLAWGAME_API = os.getenv("CLAWGAME_API", "http://localhost:8000")
 
 RESULT_CHECK_INTERVAL = 10
 HYPE_TWEET_INTERVAL = 240
+TWEET_LIMIT = 50               # tweets allowed per window
+TWEET_LIMIT_WINDOW = 15 * 60   # seconds
 
 POSTED_FILE = Path(__file__).parent / "posted.json"
 HYPE_POSTED_FILE = Path(__file__).parent / "hype_posted.json"
@@ -49,19 +52,48 @@ log = logging.getLogger("clawgame-bot")
 #                      TWITTER CLIENT
 # ============================================================
 
-def get_twitter_client() -> tweepy.Client:
-    return tweepy.Client(
+def get_twitter_client() -> AsyncClient:
+    return AsyncClient(
         consumer_key=TWITTER_API_KEY,
         consumer_secret=TWITTER_API_SECRET,
         access_token=TWITTER_ACCESS_TOKEN,
         access_token_secret=TWITTER_ACCESS_SECRET,
     )
 
+# One client for the process — reuses its OAuth session and connection
+twitter = get_twitter_client()
 
-def post_tweet(text: str) -> bool:
+
+class TokenBucket:
+    """Allows bursts up to `capacity`, refilling at capacity/window per second."""
+
+    def __init__(self, capacity: int, window: float):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self.lock = asyncio.Lock()  # waiters queue up instead of all waking at once
+
+    async def acquire(self):
+        """Take a token, sleeping only if the bucket is empty."""
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate
+                log.info(f"Tweet rate limit reached, waiting {wait:.0f}s")
+                await asyncio.sleep(wait)
+                self.tokens, self.last = 1.0, time.monotonic()
+            self.tokens -= 1
+
+tweet_limiter = TokenBucket(TWEET_LIMIT, TWEET_LIMIT_WINDOW)
+
+
+async def post_tweet(text: str) -> bool:
+    await tweet_limiter.acquire()
     try:
-        client = get_twitter_client()
-        client.create_tweet(text=text)
+        await twitter.create_tweet(text=text)
         log.info(f"Tweeted: {text[:80]}...")
         return True
     except Exception as e:
@@ -72,7 +104,7 @@ def post_tweet(text: str) -> bool:
 #                      CLAUDE CLIENT
 # ============================================================
 
-claude = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
+claude = anthropic.AsyncAnthropic(api_key=CLAUDE_API_KEY)
 
 SYSTEM_PROMPT = """You are the social media voice for Claw Game, the first PvP Battle Royale arena for AI agents on Base blockchain.
 
@@ -99,21 +131,37 @@ Key facts:
 
 Keep tweets under 270 characters. Output ONLY the tweet text, nothing else."""
 
+# Built once and marked for Anthropic's prompt cache, so a burst of tweets
+# reuses the cached prefix. Prompts under the model's minimum cacheable
+# length are just sent uncached, so the marker is safe either way.
+SYSTEM_BLOCKS = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
 
-def generate_tweet(prompt: str) -> str:
+# Whole tweet wrapped in straight or curly quotes
+_QUOTED_RE = re.compile(r'^\s*["“](.*)["”]\s*$', re.DOTALL)
+TWEET_MAX_CHARS = 278
+
+
+def clean_tweet(text: str) -> str:
+    """Strip wrapping quotes, then cut at a word boundary if it's too long."""
+    text = _QUOTED_RE.sub(r"\1", text).strip()
+    if len(text) > TWEET_MAX_CHARS:
+        # str slicing is per code point; back up to whitespace so no word is split
+        cut = text[:TWEET_MAX_CHARS - 3]
+        head, space, _ = cut.rpartition(" ")
+        text = (head if space else cut) + "..."
+    return text
+
+
+async def generate_tweet(prompt: str) -> str:
     try:
-        response = claude.messages.create(
+        response = await claude.messages.create(
             model="claude-sonnet-4-5-20250929",
             max_tokens=150,
-            system=SYSTEM_PROMPT,
+            system=SYSTEM_BLOCKS,
             messages=[{"role": "user", "content": prompt}],
         )
-        tweet = response.content[0].text.strip()
-        if tweet.startswith('"') and tweet.endswith('"'):
-            tweet = tweet[1:-1]
-        if len(tweet) > 278:
-            tweet = tweet[:275] + "..."
-        return tweet
+        return clean_tweet(response.content[0].text)
     except Exception as e:
         log.error(f"Claude generation failed: {e}")
         return ""
@@ -122,37 +170,85 @@ def generate_tweet(prompt: str) -> str:
 #                    TOURNAMENT RESULTS
 # ============================================================
 
-def load_posted(filepath: Path) -> set:
-    if filepath.exists():
-        try:
-            return set(json.loads(filepath.read_text()))
-        except Exception:
-            return set()
-    return set()
+# Shared keep-alive connection to the Claw Game API across polls
+api = httpx.AsyncClient(base_url=CLAWGAME_API, timeout=10)
+
+# Last ETag per polled path; an unchanged poll comes back 304 with no body
+etags: dict[str, str] = {}
 
-def save_posted(filepath: Path, posted: set):
-    filepath.write_text(json.dumps(list(posted)))
 
+async def api_get(path: str, **params):
+    """GET JSON from the API, or None if nothing changed since the last poll."""
+    headers = {"If-None-Match": etags[path]} if path in etags else {}
+    resp = await api.get(path, params=params, headers=headers)
+    if resp.status_code == 304:
+        return None
+    resp.raise_for_status()
+    if etag := resp.headers.get("ETag"):
+        etags[path] = etag
+    return orjson.loads(resp.content)
 
-def check_and_post_results():
+
+# The bot is the only writer of these files: read each once, keep it in memory.
+# Both hold constant-size checkpoints; older versions stored ever-growing
+# lists of posted ids, which load_state hands back as-is for migration.
+state_cache: dict[Path, object] = {}
+
+def load_state(filepath: Path, default):
+    if filepath not in state_cache:
+        state = default
+        if filepath.exists():
+            try:
+                state = orjson.loads(filepath.read_bytes())
+            except Exception:
+                pass
+        state_cache[filepath] = state
+    return state_cache[filepath]
+
+def save_state(filepath: Path, state):
+    state_cache[filepath] = state
+    # Write-then-rename so a crash mid-write never leaves a truncated file
+    tmp = filepath.with_suffix(".tmp")
+    tmp.write_bytes(orjson.dumps(state))
+    tmp.replace(filepath)
+
+
+RESULTS_BATCH = 10
+HYPE_THRESHOLDS = (90, 75, 50)  # highest first
+
+
+async def check_and_post_results():
     log.info("Checking for new tournament results...")
-    posted = load_posted(POSTED_FILE)
+    state = load_state(POSTED_FILE, {})
+    if isinstance(state, list):  # pre-checkpoint file: posted tournament ids
+        state = {"since": None, "legacy_posted": state}
+    since = state.get("since")
 
     try:
-        resp = httpx.get(f"{CLAWGAME_API}/api/v1/tournaments/history?limit=5", timeout=10)
-        data = resp.json()
+        if since:
+            # Only what finished after the last posted result, oldest first
+            data = await api_get("/api/v1/tournaments/history", since=since, limit=RESULTS_BATCH)
+        else:
+            data = await api_get("/api/v1/tournaments/history", limit=5)
     except Exception as e:
         log.error(f"API request failed: {e}")
         return
+    if data is None:
+        return  # unchanged since last check
 
     arena_names = ["Bronze 🥉", "Silver 🥈", "Gold 🥇"]
 
     # API returns { tournaments: [...] }
     tournament_list = data.get("tournaments", data) if isinstance(data, dict) else data
+    if not since:
+        tournament_list = tournament_list[::-1]  # first run: newest-first page
+    legacy_posted = set(state.get("legacy_posted", ()))
 
+    todo = []
     for t in tournament_list:
         tid = str(t["id"])
-        if tid in posted:
+        if tid in legacy_posted:
+            todo.append((t["cursor"], None))
             continue
 
         arena = t.get("arena", 0)
@@ -168,42 +264,73 @@ def check_and_post_results():
 - Tournament #{tid}
 
 Make it exciting, short, degen-friendly. Celebrate the winner."""
+        todo.append((t["cursor"], prompt))
 
-        tweet = generate_tweet(prompt)
-        if tweet and post_tweet(tweet):
-            posted.add(tid)
-            save_posted(POSTED_FILE, posted)
-            time.sleep(5)
-
-
-def check_registration_hype():
+    # Generate concurrently, post one at a time (Twitter rate limits)
+    tweets = await asyncio.gather(*(generate_tweet(p) for _, p in todo if p))
+    tweets = iter(tweets)
+    done = 0
     try:
-        resp = httpx.get(f"{CLAWGAME_API}/api/v1/tournaments/current", timeout=10)
-        data = resp.json()
+        # The checkpoint only moves past a result once it's posted, so stop
+        # at the first failure and pick up from there next tick
+        for cursor, prompt in todo:
+            if prompt is not None:
+                tweet = next(tweets)
+                if not (tweet and await post_tweet(tweet)):
+                    break
+            since = cursor
+            done += 1
+    finally:
+        if done:
+            save_state(POSTED_FILE, {"since": since})
+        if done < len(todo):
+            etags.pop("/api/v1/tournaments/history", None)  # retry the rest next tick
+
+
+async def check_registration_hype():
+    try:
+        data = await api_get("/api/v1/tournaments/current")
     except Exception:
         return
+    if data is None:
+        return  # unchanged since last check
 
     arena_names = ["Bronze", "Silver", "Gold"]
-    hype_posted = load_posted(HYPE_POSTED_FILE)
+    # {tournament id: highest threshold already hyped}
+    hyped = load_state(HYPE_POSTED_FILE, {})
+    if isinstance(hyped, list):  # pre-checkpoint file: "tid-threshold" keys
+        migrated = {}
+        for key in hyped:
+            tid, _, threshold = key.rpartition("-")
+            migrated[tid] = max(migrated.get(tid, 0), int(threshold))
+        hyped = migrated
 
     # API returns { tournaments: [...] }
     tournament_list = data.get("tournaments", data) if isinstance(data, dict) else data
 
+    # Only currently-open tournaments can still cross a threshold
+    open_ids = {str(t.get("id", 0)) for t in tournament_list}
+    if hyped.keys() - open_ids:
+        hyped = {tid: th for tid, th in hyped.items() if tid in open_ids}
+        save_state(HYPE_POSTED_FILE, hyped)
+
     for t in tournament_list:
         count = t.get("player_count", 0)
         arena = t.get("arena", 0)
         tid = str(t.get("id", 0))
 
-        for threshold in [50, 75, 90]:
-            key = f"{tid}-{threshold}"
-            if count >= threshold and key not in hype_posted:
-                prompt = f"""Write a hype tweet: the {arena_names[min(arena,2)]} arena has {count}/100 agents registered!
+        # Highest milestone reached; lower ones it skipped past stay unposted
+        threshold = next((th for th in HYPE_THRESHOLDS if count >= th), 0)
+        if threshold <= hyped.get(tid, 0):
+            continue
+        prompt = f"""Write a hype tweet: the {arena_names[min(arena,2)]} arena has {count}/100 agents registered!
 Only {100 - count} spots left. Build urgency. Short and punchy."""
-                tweet = generate_tweet(prompt)
-                if tweet and post_tweet(tweet):
-                    hype_posted.add(key)
-                    save_posted(HYPE_POSTED_FILE, hype_posted)
-                    return
+        # One hype tweet per tick; re-fetch next tick for anything left
+        etags.pop("/api/v1/tournaments/current", None)
+        tweet = await generate_tweet(prompt)
+        if tweet and await post_tweet(tweet):
+            save_state(HYPE_POSTED_FILE, {**hyped, tid: threshold})
+            return
 
 # ============================================================
 #                      HYPE TWEETS
@@ -228,12 +355,12 @@ HYPE_PROMPTS = [
 ]
 
 
-def post_hype_tweet():
+async def post_hype_tweet():
     log.info("Generating hype tweet...")
     prompt = random.choice(HYPE_PROMPTS)
-    tweet = generate_tweet(prompt)
+    tweet = await generate_tweet(prompt)
     if tweet:
-        post_tweet(tweet)
+        await post_tweet(tweet)
 
 # ============================================================
 #                         MAIN
@@ -252,6 +379,41 @@ def validate_config():
     return True
 
 
+async def periodic(task, seconds: float):
+    """
+    Run task() now and then every `seconds`, measured start to start.
+    A failing run still waits out the rest of its interval before retrying.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        try:
+            await task()
+        except Exception as e:
+            log.error(f"{task.__name__} failed: {e}")
+        await asyncio.sleep(max(0.0, seconds - (loop.time() - start)))
+
+
+async def amain():
+    try:
+        me = await twitter.get_me()
+        log.info(f"Connected as @{me.data.username}")
+    except Exception as e:
+        log.error(f"Twitter connection failed: {e}")
+        return
+
+    # The first hype run doubles as the startup tweet
+    log.info("Bot running. Ctrl+C to stop.")
+    try:
+        await asyncio.gather(
+            periodic(check_and_post_results, RESULT_CHECK_INTERVAL * 60),
+            periodic(check_registration_hype, RESULT_CHECK_INTERVAL * 60),
+            periodic(post_hype_tweet, HYPE_TWEET_INTERVAL * 60),
+        )
+    finally:
+        await api.aclose()
+
+
 def main():
     print("""
     ╔══════════════════════════════════════╗
@@ -264,24 +426,9 @@ def main():
         return
 
     try:
-        client = get_twitter_client()
-        me = client.get_me()
-        log.info(f"Connected as @{me.data.username}")
-    except Exception as e:
-        log.error(f"Twitter connection failed: {e}")
-        return
-
-    schedule.every(RESULT_CHECK_INTERVAL).minutes.do(check_and_post_results)
-    schedule.every(RESULT_CHECK_INTERVAL).minutes.do(check_registration_hype)
-    schedule.every(HYPE_TWEET_INTERVAL).minutes.do(post_hype_tweet)
-
-    log.info("Posting startup tweet...")
-    post_hype_tweet()
-
-    log.info("Bot running. Ctrl+C to stop.")
-    while True:
-        schedule.run_pending()
-        time.sleep(30)
+        asyncio.run(amain())
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
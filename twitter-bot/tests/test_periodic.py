@@ -0,0 +1,26 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bot
+
+
+def test_periodic_waits_out_the_interval_after_a_failure():
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("API down")
+
+    async def run():
+        try:
+            await asyncio.wait_for(bot.periodic(failing, 0.1), timeout=0.35)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(run())
+    # Runs at ~0s, 0.1s, 0.2s, 0.3s — not a tight retry loop
+    assert 1 <= calls <= 4